@@ -7,9 +7,12 @@ Existing trades were all stored as strategy="NG_Gold". This script:
 3. Updates trade_records in tradememory.db
 
 Usage:
-    python scripts/research/migrate_strategy_names.py [--dry-run]
+    python scripts/research/migrate_strategy_names.py [--dry-run] [--refresh]
 
-Requires: MetaTrader5 package + MT5 terminal running
+The position → magic map is cached in data/.mt5_magic_cache.json after the
+first MT5 fetch; pass --refresh to query MT5 again.
+
+Requires: MetaTrader5 package + MT5 terminal running (first run / --refresh)
 """
 
 import os
@@ -20,6 +23,10 @@ from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from tradememory.db import CONNECTION_PRAGMAS
+
 load_dotenv()
 
 # Magic number → strategy name mapping (same as mt5_sync.py)
@@ -34,10 +41,24 @@ MAGIC_TO_STRATEGY = {
 }
 
 DB_PATH = os.getenv("TRADEMEMORY_DB", "data/tradememory.db")
+MAGIC_CACHE_PATH = Path("data/.mt5_magic_cache.json")
+
+
+def _tune(conn: sqlite3.Connection) -> None:
+    """Apply the same PRAGMAs as Database connections right after connecting."""
+    conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
 
 
-def get_mt5_magic_map() -> dict:
+def get_mt5_magic_map(refresh: bool = False) -> dict:
     """Query MT5 for all historical deals and build position_id → magic mapping."""
+    if not refresh and MAGIC_CACHE_PATH.exists():
+        with open(MAGIC_CACHE_PATH, encoding="utf-8") as f:
+            magic_map = {int(k): v for k, v in json.load(f).items()}
+        print(f"[OK] Loaded {len(magic_map)} position → magic mappings from {MAGIC_CACHE_PATH}")
+        return magic_map
+
     try:
         import MetaTrader5 as MT5
     except ImportError:
@@ -76,38 +97,36 @@ def get_mt5_magic_map() -> dict:
             magic_map[deal.position_id] = deal.magic
 
     print(f"[OK] Found {len(magic_map)} position → magic mappings")
+
+    MAGIC_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(MAGIC_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(magic_map, f)
     return magic_map
 
 
-def migrate(dry_run: bool = False):
+def migrate(dry_run: bool = False, refresh: bool = False):
     """Run the migration."""
     print(f"Database: {DB_PATH}")
     print(f"Dry run: {dry_run}")
     print()
 
     # Step 1: Get MT5 magic numbers
-    magic_map = get_mt5_magic_map()
+    magic_map = get_mt5_magic_map(refresh=refresh)
 
     # Step 2: Read current DB state
     conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    _tune(conn)
     rows = conn.execute(
-        "SELECT id, strategy, reasoning, market_context FROM trade_records"
+        "SELECT id, strategy, reasoning, market_context FROM trade_records "
+        "WHERE id LIKE 'MT5-%'"
     ).fetchall()
 
-    print(f"\nFound {len(rows)} trades in DB:")
+    print(f"\nFound {len(rows)} MT5 trades in DB:")
     print("-" * 80)
 
     updates = []
-    for row in rows:
-        trade_id = row["id"]
-        current_strategy = row["strategy"]
-
+    for trade_id, current_strategy, reasoning, market_context in rows:
         # Extract position_id from trade_id (format: MT5-{position_id})
-        if not trade_id.startswith("MT5-"):
-            print(f"  {trade_id}: SKIP (not MT5 trade)")
-            continue
-
         try:
             position_id = int(trade_id.split("-")[1])
         except (IndexError, ValueError):
@@ -122,7 +141,7 @@ def migrate(dry_run: bool = False):
         new_strategy = MAGIC_TO_STRATEGY.get(magic, f"Unknown_Magic_{magic}")
 
         # Update market_context to include magic_number
-        ctx = json.loads(row["market_context"])
+        ctx = json.loads(market_context)
         ctx["magic_number"] = magic
         new_ctx = json.dumps(ctx)
 
@@ -134,7 +153,7 @@ def migrate(dry_run: bool = False):
             f"{current_strategy} → {new_strategy} [{status}]"
         )
 
-        if current_strategy != new_strategy or "magic" not in row["reasoning"]:
+        if current_strategy != new_strategy or "magic" not in reasoning:
             updates.append((new_strategy, new_reasoning, new_ctx, trade_id))
 
     print(f"\n{len(updates)} trades need updating.")
@@ -163,4 +182,5 @@ def migrate(dry_run: bool = False):
 
 if __name__ == "__main__":
     dry_run = "--dry-run" in sys.argv
-    migrate(dry_run=dry_run)
+    refresh = "--refresh" in sys.argv
+    migrate(dry_run=dry_run, refresh=refresh)
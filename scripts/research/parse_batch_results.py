@@ -8,11 +8,15 @@ Default report_dir: batch_v1 in MT5 Terminal B reports directory
 """
 import sys
 import os
+import csv
+import heapq
 import json
+from collections import defaultdict
+from typing import NamedTuple
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-sys.stdout.reconfigure(encoding='utf-8')
+sys.stdout.reconfigure(encoding='utf-8', line_buffering=False)
 
 from tradememory.backtest_importer import (
     parse_mt5_report,
@@ -28,17 +32,20 @@ DEFAULT_REPORT_DIR = (
 
 def parse_all_reports(report_dir: str) -> list:
     """Parse all *_report.htm files and return structured results."""
-    from pathlib import Path
-
+    suffix = '_report.htm'
     results = []
-    report_files = sorted(Path(report_dir).glob('*_report.htm'))
+    with os.scandir(report_dir) as it:
+        # Case-insensitive like the Windows glob it replaced (*_REPORT.htm too)
+        report_files = sorted(
+            e.path for e in it if e.is_file() and e.name.lower().endswith(suffix)
+        )
 
     print(f"Found {len(report_files)} report files in {report_dir}")
 
     for report_path in report_files:
-        tag = report_path.stem.replace('_report', '')
+        tag = os.path.basename(report_path)[:-len(suffix)]
         variant = parse_variant_tag(tag)
-        trades = parse_mt5_report(str(report_path))
+        trades = parse_mt5_report(report_path)
 
         if not trades:
             results.append({
@@ -60,13 +67,14 @@ def parse_all_reports(report_dir: str) -> list:
             })
             continue
 
-        # Calculate stats
-        wins = [t for t in trades if t['pnl'] > 0]
-        losses = [t for t in trades if t['pnl'] < 0]
+        # Calculate stats (one pnl list feeds every reduction below)
+        pnls = [t['pnl'] for t in trades]
+        wins = [p for p in pnls if p > 0]
+        losses = [p for p in pnls if p < 0]
         n = len(wins) + len(losses)
 
-        gross_profit = sum(t['pnl'] for t in wins) if wins else 0
-        gross_loss = sum(t['pnl'] for t in losses) if losses else 0
+        gross_profit = sum(wins) if wins else 0
+        gross_loss = sum(losses) if losses else 0
         net_pnl = gross_profit + gross_loss
 
         win_rate = (len(wins) / n * 100) if n > 0 else 0
@@ -79,8 +87,8 @@ def parse_all_reports(report_dir: str) -> list:
         balance = 10000.0
         peak = 10000.0
         max_dd = 0.0
-        for t in trades:
-            balance += t['pnl']
+        for p in pnls:
+            balance += p
             if balance > peak:
                 peak = balance
             dd = peak - balance
@@ -109,40 +117,69 @@ def parse_all_reports(report_dir: str) -> list:
     return results
 
 
+class ResultIndex(NamedTuple):
+    """One-pass buckets of batch results; "active" means non-empty with trades."""
+    by_dir: defaultdict                     # (strategy, direction) -> all variants
+    active_by_dir: defaultdict              # (strategy, direction) -> active variants
+    active_by_strategy: defaultdict         # strategy -> active variants
+    active_by_symbol: defaultdict           # symbol -> active variants
+    active_by_strategy_symbol: defaultdict  # (strategy, symbol) -> active variants
+
+
+def index_results(results: list) -> ResultIndex:
+    """Bucket results in one pass so analysis functions can look up subsets."""
+    idx = ResultIndex(*(defaultdict(list) for _ in ResultIndex._fields))
+    for r in results:
+        s, sym, d = r['strategy'], r['symbol'], r['direction']
+        idx.by_dir[(s, d)].append(r)
+        if not r['empty'] and r['n_trades'] > 0:
+            idx.active_by_dir[(s, d)].append(r)
+            idx.active_by_strategy[s].append(r)
+            idx.active_by_symbol[sym].append(r)
+            idx.active_by_strategy_symbol[(s, sym)].append(r)
+    return idx
+
+
+def _emit(lines: list):
+    """Write a report block with one stdout write instead of a print per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 def print_summary_table(results: list):
     """Print formatted summary table."""
-    print("\n" + "=" * 120)
-    print("=== BATCH BACKTEST RESULTS (97 combos) ===")
-    print("=" * 120)
+    lines = []
+    out = lines.append
+
+    out("\n" + "=" * 120)
+    out("=== BATCH BACKTEST RESULTS (97 combos) ===")
+    out("=" * 120)
 
     header = f"{'Tag':<40} {'n':>5} {'PnL':>10} {'PnL%':>7} {'WR%':>6} {'PF':>6} {'AvgW':>8} {'AvgL':>8} {'RR':>5} {'DD%':>6}"
-    print(header)
-    print("-" * 120)
+    out(header)
+    out("-" * 120)
 
     for r in results:
         if r['empty']:
-            print(f"{r['tag']:<40} {'EMPTY':>5}")
+            out(f"{r['tag']:<40} {'EMPTY':>5}")
             continue
-        print(f"{r['tag']:<40} {r['n_trades']:>5} ${r['pnl']:>9.2f} {r['pnl_pct']:>6.1f}% {r['win_rate']:>5.1f} {r['profit_factor']:>6.2f} ${r['avg_win']:>7.2f} ${r['avg_loss']:>7.2f} {r['rr']:>5.2f} {r['max_dd_pct']:>5.1f}%")
+        out(f"{r['tag']:<40} {r['n_trades']:>5} ${r['pnl']:>9.2f} {r['pnl_pct']:>6.1f}% {r['win_rate']:>5.1f} {r['profit_factor']:>6.2f} ${r['avg_win']:>7.2f} ${r['avg_loss']:>7.2f} {r['rr']:>5.2f} {r['max_dd_pct']:>5.1f}%")
+
+    _emit(lines)
 
 
-def print_strategy_analysis(results: list):
+def print_strategy_analysis(results: list, idx: ResultIndex):
     """Print per-strategy summary."""
-    print("\n" + "=" * 80)
-    print("=== BY STRATEGY ===")
-    print("=" * 80)
+    lines = []
+    out = lines.append
 
-    strategies = {}
-    for r in results:
-        s = r['strategy']
-        if s not in strategies:
-            strategies[s] = []
-        strategies[s].append(r)
+    out("\n" + "=" * 80)
+    out("=== BY STRATEGY ===")
+    out("=" * 80)
 
-    for s, variants in sorted(strategies.items()):
-        active = [v for v in variants if not v['empty'] and v['n_trades'] > 0]
+    for s in sorted({r['strategy'] for r in results}):
+        active = idx.active_by_strategy.get(s, [])
         if not active:
-            print(f"\n{s}: ALL EMPTY")
+            out(f"\n{s}: ALL EMPTY")
             continue
 
         avg_pnl = sum(v['pnl_pct'] for v in active) / len(active)
@@ -153,59 +190,65 @@ def print_strategy_analysis(results: list):
         worst = min(active, key=lambda v: v['pnl_pct'])
         profitable = sum(1 for v in active if v['pnl'] > 0)
 
-        print(f"\n{s} ({len(active)} variants, {total_n} total trades):")
-        print(f"  Avg PnL: {avg_pnl:+.2f}%  |  Avg WR: {avg_wr:.1f}%  |  Avg PF: {avg_pf:.2f}")
-        print(f"  Profitable variants: {profitable}/{len(active)} ({profitable/len(active)*100:.0f}%)")
-        print(f"  BEST:  {best['tag']} → {best['pnl_pct']:+.1f}% (n={best['n_trades']}, WR={best['win_rate']}%, PF={best['profit_factor']})")
-        print(f"  WORST: {worst['tag']} → {worst['pnl_pct']:+.1f}% (n={worst['n_trades']}, WR={worst['win_rate']}%, PF={worst['profit_factor']})")
+        out(f"\n{s} ({len(active)} variants, {total_n} total trades):")
+        out(f"  Avg PnL: {avg_pnl:+.2f}%  |  Avg WR: {avg_wr:.1f}%  |  Avg PF: {avg_pf:.2f}")
+        out(f"  Profitable variants: {profitable}/{len(active)} ({profitable/len(active)*100:.0f}%)")
+        out(f"  BEST:  {best['tag']} → {best['pnl_pct']:+.1f}% (n={best['n_trades']}, WR={best['win_rate']}%, PF={best['profit_factor']})")
+        out(f"  WORST: {worst['tag']} → {worst['pnl_pct']:+.1f}% (n={worst['n_trades']}, WR={worst['win_rate']}%, PF={worst['profit_factor']})")
+
+    _emit(lines)
 
 
-def print_symbol_analysis(results: list):
+def print_symbol_analysis(results: list, idx: ResultIndex):
     """Print per-symbol summary."""
-    print("\n" + "=" * 80)
-    print("=== BY SYMBOL ===")
-    print("=" * 80)
+    lines = []
+    out = lines.append
 
-    symbols = {}
-    for r in results:
-        sym = r['symbol']
-        if sym not in symbols:
-            symbols[sym] = []
-        symbols[sym].append(r)
+    out("\n" + "=" * 80)
+    out("=== BY SYMBOL ===")
+    out("=" * 80)
 
-    for sym, variants in sorted(symbols.items()):
-        active = [v for v in variants if not v['empty'] and v['n_trades'] > 0]
+    for sym in sorted({r['symbol'] for r in results}):
+        active = idx.active_by_symbol.get(sym, [])
         if not active:
-            print(f"\n{sym}: ALL EMPTY")
+            out(f"\n{sym}: ALL EMPTY")
             continue
 
         avg_pnl = sum(v['pnl_pct'] for v in active) / len(active)
         total_n = sum(v['n_trades'] for v in active)
         profitable = sum(1 for v in active if v['pnl'] > 0)
 
-        print(f"\n{sym} ({len(active)} variants, {total_n} total trades):")
-        print(f"  Avg PnL: {avg_pnl:+.2f}%  |  Profitable: {profitable}/{len(active)}")
+        out(f"\n{sym} ({len(active)} variants, {total_n} total trades):")
+        out(f"  Avg PnL: {avg_pnl:+.2f}%  |  Profitable: {profitable}/{len(active)}")
 
+    _emit(lines)
 
-def print_top_bottom(results: list, n=10):
-    """Print top N and bottom N variants."""
-    active = [r for r in results if not r['empty'] and r['n_trades'] > 10]  # min 10 trades
-    ranked = sorted(active, key=lambda r: r['pnl_pct'], reverse=True)
 
-    print(f"\n{'=' * 80}")
-    print(f"=== TOP {n} VARIANTS (min 10 trades) ===")
-    print(f"{'=' * 80}")
-    for r in ranked[:n]:
-        print(f"  {r['pnl_pct']:>+7.1f}%  PF={r['profit_factor']:<5}  WR={r['win_rate']:<5}  RR={r['rr']:<5}  n={r['n_trades']:<4}  {r['tag']}")
+def print_top_bottom(active_results: list, n=10):
+    """Print top N and bottom N variants (from the pre-filtered active list)."""
+    lines = []
+    out = lines.append
 
-    print(f"\n{'=' * 80}")
-    print(f"=== BOTTOM {n} VARIANTS (min 10 trades) ===")
-    print(f"{'=' * 80}")
-    for r in ranked[-n:]:
-        print(f"  {r['pnl_pct']:>+7.1f}%  PF={r['profit_factor']:<5}  WR={r['win_rate']:<5}  RR={r['rr']:<5}  n={r['n_trades']:<4}  {r['tag']}")
+    active = [r for r in active_results if r['n_trades'] > 10]  # min 10 trades
+    top = heapq.nlargest(n, active, key=lambda r: r['pnl_pct'])
+    bottom = heapq.nsmallest(n, active, key=lambda r: r['pnl_pct'])[::-1]  # best-first, like top
+
+    out(f"\n{'=' * 80}")
+    out(f"=== TOP {n} VARIANTS (min 10 trades) ===")
+    out(f"{'=' * 80}")
+    for r in top:
+        out(f"  {r['pnl_pct']:>+7.1f}%  PF={r['profit_factor']:<5}  WR={r['win_rate']:<5}  RR={r['rr']:<5}  n={r['n_trades']:<4}  {r['tag']}")
+
+    out(f"\n{'=' * 80}")
+    out(f"=== BOTTOM {n} VARIANTS (min 10 trades) ===")
+    out(f"{'=' * 80}")
+    for r in bottom:
+        out(f"  {r['pnl_pct']:>+7.1f}%  PF={r['profit_factor']:<5}  WR={r['win_rate']:<5}  RR={r['rr']:<5}  n={r['n_trades']:<4}  {r['tag']}")
 
+    _emit(lines)
 
-def validate_ground_truth(results: list):
+
+def validate_ground_truth(results: list, idx: ResultIndex):
     """
     L2 Validation: Check if batch results confirm/contradict existing findings.
 
@@ -215,46 +258,48 @@ def validate_ground_truth(results: list):
     - FX-001: IM is the only profitable strategy on forex pairs
     - FX-002: VB RR on forex is fundamentally too low (0.43-0.54)
     """
-    print(f"\n{'=' * 80}")
-    print("=== L2 GROUND TRUTH VALIDATION ===")
-    print(f"{'=' * 80}")
+    lines = []
+    out = lines.append
+
+    out(f"\n{'=' * 80}")
+    out("=== L2 GROUND TRUTH VALIDATION ===")
+    out(f"{'=' * 80}")
 
     # --- MR-001: MR BUY-only in uptrend unprofitable ---
-    mr_buy = [r for r in results if r['strategy'] == 'MeanReversion' and r['direction'] == 'BUY']
-    mr_both = [r for r in results if r['strategy'] == 'MeanReversion' and r['direction'] == 'BOTH']
+    mr_buy = idx.by_dir.get(('MeanReversion', 'BUY'), [])
+    mr_both = idx.by_dir.get(('MeanReversion', 'BOTH'), [])
+    active_mr_buy = idx.active_by_dir.get(('MeanReversion', 'BUY'), [])
 
     if mr_buy:
-        active_mr_buy = [r for r in mr_buy if not r['empty'] and r['n_trades'] > 0]
         if active_mr_buy:
             avg_pnl_buy = sum(r['pnl_pct'] for r in active_mr_buy) / len(active_mr_buy)
             profitable_buy = sum(1 for r in active_mr_buy if r['pnl'] > 0)
-            print(f"\n[MR-001] MR BUY-only in uptrend market:")
-            print(f"  Variants: {len(active_mr_buy)}  |  Avg PnL: {avg_pnl_buy:+.2f}%  |  Profitable: {profitable_buy}/{len(active_mr_buy)}")
+            out(f"\n[MR-001] MR BUY-only in uptrend market:")
+            out(f"  Variants: {len(active_mr_buy)}  |  Avg PnL: {avg_pnl_buy:+.2f}%  |  Profitable: {profitable_buy}/{len(active_mr_buy)}")
             if avg_pnl_buy < 0 and profitable_buy == 0:
-                print(f"  → CONFIRMED: MR BUY-only all negative in bull market ✅")
+                out(f"  → CONFIRMED: MR BUY-only all negative in bull market ✅")
             elif avg_pnl_buy < 0:
-                print(f"  → MOSTLY CONFIRMED: avg negative, some profitable variants ⚠️")
+                out(f"  → MOSTLY CONFIRMED: avg negative, some profitable variants ⚠️")
             else:
-                print(f"  → INVALIDATED: avg positive! MR-001 needs revision ❌")
+                out(f"  → INVALIDATED: avg positive! MR-001 needs revision ❌")
 
     if mr_both:
-        active_mr_both = [r for r in mr_both if not r['empty'] and r['n_trades'] > 0]
+        active_mr_both = idx.active_by_dir.get(('MeanReversion', 'BOTH'), [])
         if active_mr_both:
             avg_pnl_both = sum(r['pnl_pct'] for r in active_mr_both) / len(active_mr_both)
             profitable_both = sum(1 for r in active_mr_both if r['pnl'] > 0)
-            print(f"\n  MR BOTH for comparison:")
-            print(f"  Variants: {len(active_mr_both)}  |  Avg PnL: {avg_pnl_both:+.2f}%  |  Profitable: {profitable_both}/{len(active_mr_both)}")
+            out(f"\n  MR BOTH for comparison:")
+            out(f"  Variants: {len(active_mr_both)}  |  Avg PnL: {avg_pnl_both:+.2f}%  |  Profitable: {profitable_both}/{len(active_mr_both)}")
             if active_mr_buy:
-                active_mr_buy2 = [r for r in mr_buy if not r['empty'] and r['n_trades'] > 0]
-                avg_buy = sum(r['pnl_pct'] for r in active_mr_buy2) / len(active_mr_buy2)
+                avg_buy = sum(r['pnl_pct'] for r in active_mr_buy) / len(active_mr_buy)
                 delta = avg_pnl_both - avg_buy
-                print(f"  → BOTH vs BUY-only delta: {delta:+.2f}% ({'BOTH better' if delta > 0 else 'BUY-only better'})")
+                out(f"  → BOTH vs BUY-only delta: {delta:+.2f}% ({'BOTH better' if delta > 0 else 'BUY-only better'})")
 
     # --- FX-001: IM is the only profitable strategy on forex ---
     # This batch only has XAUUSD and EURUSD, so check EURUSD results
-    eurusd = [r for r in results if r['symbol'] == 'EURUSD' and not r['empty'] and r['n_trades'] > 0]
+    eurusd = idx.active_by_symbol.get('EURUSD', [])
     if eurusd:
-        print(f"\n[FX-001] Strategy performance on EURUSD:")
+        out(f"\n[FX-001] Strategy performance on EURUSD:")
         strats_eurusd = {}
         for r in eurusd:
             s = r['strategy']
@@ -265,7 +310,7 @@ def validate_ground_truth(results: list):
         for s, variants in sorted(strats_eurusd.items()):
             avg_pnl = sum(v['pnl_pct'] for v in variants) / len(variants)
             profitable = sum(1 for v in variants if v['pnl'] > 0)
-            print(f"  {s}: Avg PnL={avg_pnl:+.2f}%, Profitable={profitable}/{len(variants)}")
+            out(f"  {s}: Avg PnL={avg_pnl:+.2f}%, Profitable={profitable}/{len(variants)}")
 
         im_eurusd = strats_eurusd.get('IntradayMomentum', [])
         non_im = [r for r in eurusd if r['strategy'] != 'IntradayMomentum']
@@ -273,46 +318,47 @@ def validate_ground_truth(results: list):
             im_avg = sum(v['pnl_pct'] for v in im_eurusd) / len(im_eurusd)
             non_im_avg = sum(v['pnl_pct'] for v in non_im) / len(non_im)
             if im_avg > 0 and non_im_avg < 0:
-                print(f"  → CONFIRMED: IM positive ({im_avg:+.2f}%), others negative ({non_im_avg:+.2f}%) ✅")
+                out(f"  → CONFIRMED: IM positive ({im_avg:+.2f}%), others negative ({non_im_avg:+.2f}%) ✅")
             elif im_avg > non_im_avg:
-                print(f"  → PARTIALLY CONFIRMED: IM best ({im_avg:+.2f}%), others ({non_im_avg:+.2f}%) ⚠️")
+                out(f"  → PARTIALLY CONFIRMED: IM best ({im_avg:+.2f}%), others ({non_im_avg:+.2f}%) ⚠️")
             else:
-                print(f"  → INVALIDATED: IM not best on EURUSD ❌")
+                out(f"  → INVALIDATED: IM not best on EURUSD ❌")
 
     # --- FX-002: VB RR too low on forex ---
-    vb_xauusd = [r for r in results if r['strategy'] == 'VolBreakout' and r['symbol'] == 'XAUUSD' and not r['empty'] and r['n_trades'] > 0]
-    vb_eurusd = [r for r in results if r['strategy'] == 'VolBreakout' and r['symbol'] == 'EURUSD' and not r['empty'] and r['n_trades'] > 0]
+    vb_xauusd = idx.active_by_strategy_symbol.get(('VolBreakout', 'XAUUSD'), [])
 
     # VB is XAUUSD-only in this batch, so validate RR range on XAUUSD
     if vb_xauusd:
         avg_rr = sum(r['rr'] for r in vb_xauusd) / len(vb_xauusd)
         avg_pf = sum(r['profit_factor'] for r in vb_xauusd) / len(vb_xauusd)
         profitable_vb = sum(1 for r in vb_xauusd if r['pnl'] > 0)
-        print(f"\n[FX-002] VB on XAUUSD (baseline — forex comparison from FX-001):")
-        print(f"  Variants: {len(vb_xauusd)}  |  Avg RR: {avg_rr:.2f}  |  Avg PF: {avg_pf:.2f}  |  Profitable: {profitable_vb}/{len(vb_xauusd)}")
-        print(f"  → Previous forex VB RR was 0.43-0.54 (FX-001). XAUUSD RR should be much higher.")
+        out(f"\n[FX-002] VB on XAUUSD (baseline — forex comparison from FX-001):")
+        out(f"  Variants: {len(vb_xauusd)}  |  Avg RR: {avg_rr:.2f}  |  Avg PF: {avg_pf:.2f}  |  Profitable: {profitable_vb}/{len(vb_xauusd)}")
+        out(f"  → Previous forex VB RR was 0.43-0.54 (FX-001). XAUUSD RR should be much higher.")
         if avg_rr > 1.5:
-            print(f"  → CONFIRMED: XAUUSD VB RR ({avg_rr:.2f}) >> forex VB RR (0.43-0.54) ✅")
+            out(f"  → CONFIRMED: XAUUSD VB RR ({avg_rr:.2f}) >> forex VB RR (0.43-0.54) ✅")
         else:
-            print(f"  → NEEDS INVESTIGATION: XAUUSD VB RR ({avg_rr:.2f}) lower than expected ⚠️")
+            out(f"  → NEEDS INVESTIGATION: XAUUSD VB RR ({avg_rr:.2f}) lower than expected ⚠️")
 
     # --- Direction analysis: BUY vs BOTH across strategies ---
-    print(f"\n{'=' * 80}")
-    print("=== DIRECTION ANALYSIS: BUY-only vs BOTH ===")
-    print(f"{'=' * 80}")
+    out(f"\n{'=' * 80}")
+    out("=== DIRECTION ANALYSIS: BUY-only vs BOTH ===")
+    out(f"{'=' * 80}")
 
     for strat in ['VolBreakout', 'IntradayMomentum', 'MeanReversion']:
-        buy_only = [r for r in results if r['strategy'] == strat and r['direction'] == 'BUY' and not r['empty'] and r['n_trades'] > 0]
-        both = [r for r in results if r['strategy'] == strat and r['direction'] == 'BOTH' and not r['empty'] and r['n_trades'] > 0]
+        buy_only = idx.active_by_dir.get((strat, 'BUY'), [])
+        both = idx.active_by_dir.get((strat, 'BOTH'), [])
 
         if buy_only and both:
             avg_buy = sum(r['pnl_pct'] for r in buy_only) / len(buy_only)
             avg_both = sum(r['pnl_pct'] for r in both) / len(both)
-            print(f"\n  {strat}:")
-            print(f"    BUY-only: {avg_buy:+.2f}% avg ({len(buy_only)} variants)")
-            print(f"    BOTH:     {avg_both:+.2f}% avg ({len(both)} variants)")
+            out(f"\n  {strat}:")
+            out(f"    BUY-only: {avg_buy:+.2f}% avg ({len(buy_only)} variants)")
+            out(f"    BOTH:     {avg_both:+.2f}% avg ({len(both)} variants)")
             delta = avg_both - avg_buy
-            print(f"    Delta:    {delta:+.2f}% ({'BOTH better' if delta > 0 else 'BUY-only better'})")
+            out(f"    Delta:    {delta:+.2f}% ({'BOTH better' if delta > 0 else 'BUY-only better'})")
+
+    _emit(lines)
 
 
 def export_json(results: list, output_path: str):
@@ -322,6 +368,15 @@ def export_json(results: list, output_path: str):
     print(f"\nJSON exported to: {output_path}")
 
 
+def export_csv(results: list, output_path: str):
+    """Export results as flat CSV (one row per variant) for pandas/duckdb."""
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"CSV exported to: {output_path}")
+
+
 def main():
     report_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_REPORT_DIR
 
@@ -335,17 +390,23 @@ def main():
         print("No reports found!")
         sys.exit(1)
 
+    idx = index_results(results)
+    active_results = [r for r in results if not r['empty'] and r['n_trades'] > 0]
+
     print_summary_table(results)
-    print_strategy_analysis(results)
-    print_symbol_analysis(results)
-    print_top_bottom(results)
-    validate_ground_truth(results)
+    print_strategy_analysis(results, idx)
+    print_symbol_analysis(results, idx)
+    print_top_bottom(active_results)
+    validate_ground_truth(results, idx)
 
-    # Export JSON
+    # Export JSON + CSV sidecar
     json_path = os.path.join(report_dir, 'batch_results.json')
     export_json(results, json_path)
+    export_csv(results, os.path.join(report_dir, 'batch_results.csv'))
 
-    # Summary stats
+    # Summary stats. Deliberately not active_results: n_trades counts only
+    # non-zero-PnL trades, so a non-empty variant can have n_trades == 0.
+    # It still counts as Active here, so Active + Empty == total.
     active = [r for r in results if not r['empty']]
     empty = [r for r in results if r['empty']]
     profitable = [r for r in active if r['pnl'] > 0]
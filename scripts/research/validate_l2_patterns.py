@@ -5,11 +5,16 @@ Compares patterns in the patterns table (source='backtest_auto') against
 the 5 manual L2 findings from MEMORY.md: MR-001, MR-002, FX-001, FX-002, BATCH-001.
 
 Usage:
-    python scripts/research/validate_l2_patterns.py [db_path]
+    python scripts/research/validate_l2_patterns.py [db_path] [--refresh]
 
 Default db_path: data/backtest_v1.db
+
+Discovery results are cached in data/.cache/, keyed on the trade rows it
+reads; pass --refresh to rerun discovery anyway.
 """
 
+import hashlib
+import json
 import sys
 import os
 
@@ -21,16 +26,51 @@ from tradememory.journal import TradeJournal
 from tradememory.reflection import ReflectionEngine
 
 
-def validate(db_path: str):
-    """Run pattern discovery and validate against manual L2."""
+CACHE_DIR = os.path.join("data", ".cache")
+
+# trade_records columns the discovery detectors read, plus market_context,
+# which migrations (migrate_strategy_names.py) rewrite in place
+DISCOVERY_COLUMNS = "id, timestamp, strategy, symbol, direction, pnl, tags, market_context"
+
+
+def _discovery_cache_path(db: Database) -> str:
+    """Sentinel path keyed by DB path + a hash of the rows discovery reads.
+
+    Hashing the row contents catches in-place UPDATEs that leave counts and
+    totals alone. File mtime is no key under WAL: writes land in the -wal
+    file and reach the main file only at checkpoint.
+    """
+    h = hashlib.blake2b(os.path.abspath(db.db_path).encode(), digest_size=16)
+    with db.get_connection() as conn:
+        for row in conn.execute(
+            f"SELECT {DISCOVERY_COLUMNS} FROM trade_records ORDER BY rowid"
+        ):
+            h.update(repr(tuple(row)).encode())
+    return os.path.join(CACHE_DIR, f"patterns-{h.hexdigest()}.json")
+
+
+def validate(db_path: str, refresh: bool = False):
+    """Run pattern discovery and validate against manual L2.
+
+    refresh=True reruns discovery even when the cache has an entry.
+    """
     db = Database(db_path)
     journal = TradeJournal(db=db)
     engine = ReflectionEngine(journal=journal)
 
     print(f"Database: {db_path}")
-    print("Running pattern discovery...")
-    discovered = engine.discover_patterns_from_backtest(db=db)
-    print(f"Discovered {len(discovered)} patterns\n")
+    cache_path = _discovery_cache_path(db)
+    if not refresh and os.path.isfile(cache_path):
+        with open(cache_path, encoding='utf-8') as f:
+            n_discovered = json.load(f)['discovered']
+        print(f"Pattern discovery cached ({cache_path}), skipping")
+    else:
+        print("Running pattern discovery...")
+        n_discovered = len(engine.discover_patterns_from_backtest(db=db))
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'db_path': db_path, 'discovered': n_discovered}, f)
+    print(f"Discovered {n_discovered} patterns\n")
 
     # Re-read from DB to get properly deserialized metrics
     patterns = db.query_patterns(limit=500)
@@ -206,13 +246,15 @@ def validate(db_path: str):
 
 
 def main():
-    db_path = sys.argv[1] if len(sys.argv) > 1 else "data/backtest_v1.db"
+    args = [a for a in sys.argv[1:] if a != "--refresh"]
+    db_path = args[0] if args else "data/backtest_v1.db"
+    refresh = "--refresh" in sys.argv
 
     if not os.path.isfile(db_path):
         print(f"ERROR: Database not found: {db_path}")
         sys.exit(1)
 
-    confirmed, partial, not_found = validate(db_path)
+    confirmed, partial, not_found = validate(db_path, refresh=refresh)
 
     if confirmed >= 3:
         print(f"\n✅ PASS: {confirmed}/5 manual patterns confirmed by auto-discovery")
@@ -8,6 +8,7 @@ Usage:
     python scripts/research/weekly_report.py [--output reports/]
 """
 
+import io
 import os
 import sys
 import json
@@ -15,16 +16,18 @@ import sqlite3
 import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
 
 sys.stdout.reconfigure(encoding="utf-8")
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
 from dotenv import load_dotenv
 load_dotenv(PROJECT_ROOT / ".env")
 
+from tradememory.db import CONNECTION_PRAGMAS
+
 DB_PATH = PROJECT_ROOT / "data" / "tradememory.db"
 BACKTEST_DB = PROJECT_ROOT / "data" / "backtest_v1.db"
 
@@ -53,19 +56,63 @@ BACKTEST_BASELINE = {
     },
 }
 
+# Live strategies in report order, plus lookups derived once at import
+DEPLOYED_STRATEGIES = ("VolBreakout", "IntradayMomentum", "Pullback")
+_DEPLOYED_SET = frozenset(DEPLOYED_STRATEGIES)
+_BASELINE_WR = {s: b["avg_wr"] for s, b in BACKTEST_BASELINE.items()}
+
 
-def get_trades_since(since_date):
-    """Get all trades from DB since a given date."""
+def open_report_db():
+    """
+    Open one connection to DB_PATH, shared by every report query.
+
+    Uses the same per-connection PRAGMAs as Database. The journal mode is
+    left alone: the report only reads, and Database sets WAL on init.
+    Returns None if the database does not exist yet.
+    """
     if not DB_PATH.exists():
-        return []
+        return None
     conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    rows = conn.execute(
-        "SELECT * FROM trade_records WHERE timestamp >= ? ORDER BY timestamp",
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    return conn
+
+
+def count_trades_since(conn, since_date):
+    """Count all trades (open + closed) in DB since a given date."""
+    if conn is None:
+        return 0
+    (count,) = conn.execute(
+        "SELECT COUNT(*) FROM trade_records WHERE timestamp >= ?",
+        (since_date.isoformat(),),
+    ).fetchone()
+    return count
+
+
+def get_strategy_aggregates(conn, since_date):
+    """
+    Per-strategy closed-trade aggregates since a given date, computed in SQLite.
+
+    Returns rows of (strategy, total, wins, losses, gross_profit, gross_loss, total_pnl).
+    COUNT(pnl)/TOTAL() skip open trades (pnl NULL) without dropping the strategy.
+    """
+    if conn is None:
+        return []
+    return conn.execute(
+        """
+        SELECT strategy,
+               COUNT(pnl),
+               TOTAL(pnl > 0),
+               TOTAL(pnl <= 0),
+               TOTAL(CASE WHEN pnl > 0 THEN pnl END),
+               TOTAL(CASE WHEN pnl <= 0 THEN pnl END),
+               TOTAL(pnl)
+        FROM trade_records
+        WHERE timestamp >= ?
+        GROUP BY strategy
+        """,
         (since_date.isoformat(),),
     ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
 
 
 def get_backtest_stats(strategy, symbol="XAUUSD"):
@@ -73,12 +120,11 @@ def get_backtest_stats(strategy, symbol="XAUUSD"):
     if not BACKTEST_DB.exists():
         return None
     conn = sqlite3.connect(str(BACKTEST_DB))
-    conn.row_factory = sqlite3.Row
 
     # Attempt to query — backtest DB schema may differ
     try:
         rows = conn.execute(
-            "SELECT * FROM trade_records WHERE strategy LIKE ? AND symbol = ?",
+            "SELECT pnl FROM trade_records WHERE strategy LIKE ? AND symbol = ?",
             (f"%{strategy}%", symbol),
         ).fetchall()
     except sqlite3.OperationalError:
@@ -89,10 +135,14 @@ def get_backtest_stats(strategy, symbol="XAUUSD"):
     if not rows:
         return None
 
-    trades = [dict(r) for r in rows]
-    total = len(trades)
-    wins = sum(1 for t in trades if (t.get("pnl") or 0) > 0)
-    total_pnl = sum(t.get("pnl") or 0 for t in trades)
+    total = len(rows)
+    wins = 0
+    total_pnl = 0
+    for (pnl,) in rows:
+        pnl = pnl or 0
+        if pnl > 0:
+            wins += 1
+        total_pnl += pnl
 
     return {
         "total_trades": total,
@@ -102,21 +152,19 @@ def get_backtest_stats(strategy, symbol="XAUUSD"):
     }
 
 
-def compute_strategy_metrics(trades):
-    """Compute per-strategy metrics from trade list."""
-    by_strategy = defaultdict(list)
-    for t in trades:
-        by_strategy[t["strategy"]].append(t)
+def compute_strategy_metrics(aggregates):
+    """
+    Compute per-strategy metrics from get_strategy_aggregates() rows.
 
+    Returns (metrics, totals); totals holds the closed-trade count and PnL
+    summed across strategies, shared by the text and JSON reports.
+    """
     metrics = {}
-    for strategy, strades in by_strategy.items():
-        closed = [t for t in strades if t.get("pnl") is not None]
-        total = len(closed)
-        wins = sum(1 for t in closed if t["pnl"] > 0)
-        losses = sum(1 for t in closed if t["pnl"] <= 0)
-        total_pnl = sum(t["pnl"] for t in closed)
-        gross_profit = sum(t["pnl"] for t in closed if t["pnl"] > 0)
-        gross_loss = abs(sum(t["pnl"] for t in closed if t["pnl"] <= 0))
+    totals = {"total_trades": 0, "total_pnl": 0}
+    for strategy, total, wins, losses, gross_profit, gross_loss, total_pnl in aggregates:
+        wins = int(wins)
+        losses = int(losses)
+        gross_loss = abs(gross_loss)
 
         pf = gross_profit / gross_loss if gross_loss > 0 else float("inf") if gross_profit > 0 else 0
         avg_win = gross_profit / wins if wins > 0 else 0
@@ -133,38 +181,38 @@ def compute_strategy_metrics(trades):
             "avg_loss": round(avg_loss, 2),
             "expectancy": round(total_pnl / total, 2) if total > 0 else 0,
         }
+        totals["total_trades"] += total
+        totals["total_pnl"] += total_pnl
 
-    return metrics
+    # Sum the raw per-strategy PnL and round once, not the rounded values
+    totals["total_pnl"] = round(totals["total_pnl"], 2)
+    return metrics, totals
 
 
-def generate_weekly_text(since_date, metrics, all_trades):
+def generate_weekly_text(since_date, metrics, totals):
     """Generate weekly report text."""
-    lines = []
-    lines.append("=" * 65)
-    lines.append(f"  Weekly Trading Report")
-    lines.append(f"  Period: {since_date.strftime('%Y-%m-%d')} → {datetime.now().strftime('%Y-%m-%d')}")
-    lines.append("=" * 65)
-
-    # Overall
-    all_closed = [t for t in all_trades if t.get("pnl") is not None]
-    total_pnl = sum(t["pnl"] for t in all_closed)
-    total_trades = len(all_closed)
-    lines.append(f"\nOverall: {total_trades} trades, PnL: ${total_pnl:,.2f}")
+    buf = io.StringIO()
+    w = buf.write
+    w("=" * 65 + "\n")
+    w(f"  Weekly Trading Report\n")
+    w(f"  Period: {since_date.strftime('%Y-%m-%d')} → {datetime.now().strftime('%Y-%m-%d')}\n")
+    w("=" * 65 + "\n")
+
+    # Overall (closed trades only)
+    w(f"\nOverall: {totals['total_trades']} trades, PnL: ${totals['total_pnl']:,.2f}\n")
 
     # Per strategy with backtest comparison
-    lines.append(f"\n{'Strategy':<20} {'Trades':>7} {'WR':>7} {'PF':>7} {'PnL':>10} {'vs Backtest':>15}")
-    lines.append(f"{'-'*20} {'-'*7} {'-'*7} {'-'*7} {'-'*10} {'-'*15}")
+    w(f"\n{'Strategy':<20} {'Trades':>7} {'WR':>7} {'PF':>7} {'PnL':>10} {'vs Backtest':>15}\n")
+    w(f"{'-'*20} {'-'*7} {'-'*7} {'-'*7} {'-'*10} {'-'*15}\n")
 
-    deployed = ["VolBreakout", "IntradayMomentum", "Pullback"]
-    for s in deployed:
+    for s in DEPLOYED_STRATEGIES:
         if s in metrics:
             m = metrics[s]
             wr_str = f"{m['win_rate']*100:.0f}%"
             pf_str = f"{m['profit_factor']:.2f}"
 
             # Compare to backtest
-            baseline = BACKTEST_BASELINE.get(s, {})
-            bt_wr = baseline.get("avg_wr", 0)
+            bt_wr = _BASELINE_WR.get(s, 0)
             drift = ""
             if m["total_trades"] >= 5 and bt_wr > 0:
                 wr_diff = m["win_rate"] - bt_wr
@@ -179,35 +227,35 @@ def generate_weekly_text(since_date, metrics, all_trades):
             else:
                 drift = f"n={m['total_trades']} (low)"
 
-            lines.append(f"{s:<20} {m['total_trades']:>7} {wr_str:>7} {pf_str:>7} ${m['total_pnl']:>8,.2f} {drift:>15}")
+            w(f"{s:<20} {m['total_trades']:>7} {wr_str:>7} {pf_str:>7} ${m['total_pnl']:>8,.2f} {drift:>15}\n")
         else:
-            lines.append(f"{s:<20} {'0':>7} {'N/A':>7} {'N/A':>7} {'$0.00':>10} {'NO TRADES':>15}")
+            w(f"{s:<20} {'0':>7} {'N/A':>7} {'N/A':>7} {'$0.00':>10} {'NO TRADES':>15}\n")
 
     # Other strategies
     for s, m in metrics.items():
-        if s not in deployed:
+        if s not in _DEPLOYED_SET:
             wr_str = f"{m['win_rate']*100:.0f}%"
-            lines.append(f"{s:<20} {m['total_trades']:>7} {wr_str:>7} {m['profit_factor']:>7.2f} ${m['total_pnl']:>8,.2f} {'(not tracked)':>15}")
+            w(f"{s:<20} {m['total_trades']:>7} {wr_str:>7} {m['profit_factor']:>7.2f} ${m['total_pnl']:>8,.2f} {'(not tracked)':>15}\n")
 
     # Known issues
-    lines.append("\n" + "-" * 65)
-    lines.append("Known Issues:")
+    w("\n" + "-" * 65 + "\n")
+    w("Known Issues:\n")
     if "IntradayMomentum" not in metrics or metrics.get("IntradayMomentum", {}).get("total_trades", 0) == 0:
-        lines.append("  [BUG] IntradayMomentum: PositionSelect blocks when VB has open position")
-        lines.append("        Fix: Replace PositionSelect(_Symbol) with HasOpenPositionByMagic()")
+        w("  [BUG] IntradayMomentum: PositionSelect blocks when VB has open position\n")
+        w("        Fix: Replace PositionSelect(_Symbol) with HasOpenPositionByMagic()\n")
     if "Pullback" not in metrics or metrics.get("Pullback", {}).get("total_trades", 0) == 0:
-        lines.append("  [TUNE] Pullback: Breakout detected but pullback level not reached")
-        lines.append("         Fix: Lower PB_PullbackPct from 0.6 to 0.5")
+        w("  [TUNE] Pullback: Breakout detected but pullback level not reached\n")
+        w("         Fix: Lower PB_PullbackPct from 0.6 to 0.5\n")
 
     # Next actions
-    lines.append("\nNext Actions:")
-    lines.append("  1. Fix IM PositionSelect bug (requires .mqh edit + recompile)")
-    lines.append("  2. Lower PB threshold (requires .set file update)")
-    lines.append("  3. OOS backtest 2022-2023 to validate BATCH-001 results")
-    lines.append("  4. After fixes: monitor for 1 week before go-live")
+    w("\nNext Actions:\n")
+    w("  1. Fix IM PositionSelect bug (requires .mqh edit + recompile)\n")
+    w("  2. Lower PB threshold (requires .set file update)\n")
+    w("  3. OOS backtest 2022-2023 to validate BATCH-001 results\n")
+    w("  4. After fixes: monitor for 1 week before go-live\n")
 
-    lines.append("=" * 65)
-    return "\n".join(lines)
+    w("=" * 65)
+    return buf.getvalue()
 
 
 def main():
@@ -222,13 +270,19 @@ def main():
     since_date = datetime.now() - timedelta(weeks=args.weeks)
     print(f"Generating weekly report since {since_date.strftime('%Y-%m-%d')}...")
 
-    trades = get_trades_since(since_date)
-    print(f"  Found {len(trades)} trades")
+    conn = open_report_db()
+    try:
+        n_trades = count_trades_since(conn, since_date)
+        aggregates = get_strategy_aggregates(conn, since_date)
+    finally:
+        if conn is not None:
+            conn.close()
+    print(f"  Found {n_trades} trades")
 
-    metrics = compute_strategy_metrics(trades)
+    metrics, totals = compute_strategy_metrics(aggregates)
 
     # Generate text report
-    text = generate_weekly_text(since_date, metrics, trades)
+    text = generate_weekly_text(since_date, metrics, totals)
     print()
     print(text)
 
@@ -243,7 +297,8 @@ def main():
         "generated_at": datetime.now().isoformat(),
         "period_start": since_date.isoformat(),
         "strategy_metrics": metrics,
-        "total_trades": len(trades),
+        "closed_totals": totals,
+        "total_trades": n_trades,
         "backtest_baselines": BACKTEST_BASELINE,
     }
     with open(json_path, "w", encoding="utf-8") as f:
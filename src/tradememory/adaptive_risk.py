@@ -6,8 +6,9 @@ Pure rule-based (no LLM dependency). Reads TradeJournal history,
 calculates performance metrics, outputs dynamic risk constraints.
 """
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
 
 from .journal import TradeJournal
 from .models import (
@@ -15,7 +16,6 @@ from .models import (
     RiskStatus,
     TradeCheckResult,
     TradeProposal,
-    TradeRecord,
 )
 from .state import StateManager
 
@@ -32,6 +32,202 @@ _SAFE_DEFAULTS = RiskConstraints(
     reason="Default constraints - insufficient trade history",
 )
 
+_SESSIONS = ("asian", "london", "newyork")
+# Session name -> position in _SESSIONS; anything else is coded -1.
+_SESSION_INDEX = {name: i for i, name in enumerate(_SESSIONS)}
+
+# Fields compared to decide whether a recalculation changed anything;
+# updated_at alone differing is not worth a write.
+_CONTENT_FIELDS = tuple(f for f in RiskConstraints.model_fields if f != "updated_at")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+_US_PER_DAY = 86_400_000_000
+
+
+def _to_epoch_us(ts: datetime) -> int:
+    """UTC epoch microseconds; naive datetimes are treated as UTC."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - _EPOCH) // _ONE_US
+
+
+def _constraints_to_state(c: RiskConstraints) -> dict:
+    """
+    JSON-safe dict of constraints, same output as model_dump(mode="json").
+
+    Built field by field because the model is flat and fixed; this skips
+    the generic serializer walk on every persist.
+    """
+    updated_at = c.updated_at.isoformat()
+    if updated_at.endswith("+00:00"):
+        updated_at = updated_at[:-6] + "Z"
+    return {
+        "max_lot_size": c.max_lot_size,
+        "risk_per_trade_pct": c.risk_per_trade_pct,
+        "daily_loss_limit": c.daily_loss_limit,
+        "scale_factor": c.scale_factor,
+        "session_adjustments": dict(c.session_adjustments),
+        "consecutive_loss_limit": c.consecutive_loss_limit,
+        "kelly_fraction": c.kelly_fraction,
+        "status": c.status.value,
+        "reason": c.reason,
+        "updated_at": updated_at,
+    }
+
+
+def _constraints_from_state(raw: dict) -> RiskConstraints:
+    """
+    Rehydrate constraints stored by _persist without re-running validation.
+
+    raw is a JSON dump of an already-validated model, so only
+    the two non-JSON-native fields need converting back.
+    """
+    fields = dict(raw)
+    if "status" in fields:
+        fields["status"] = RiskStatus(fields["status"])
+    updated_at = fields.get("updated_at")
+    if isinstance(updated_at, str):
+        # fromisoformat only accepts a trailing "Z" from Python 3.11
+        fields["updated_at"] = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+    return RiskConstraints.model_construct(**fields)
+
+
+def _never_reduces(c: RiskConstraints) -> bool:
+    """True when c cannot reduce an in-range lot: not stopped, no scale-down, no session < 1.0."""
+    return (
+        c.status != RiskStatus.STOPPED
+        and c.scale_factor >= 1.0
+        and all(v >= 1.0 for v in c.session_adjustments.values())
+    )
+
+
+@dataclass(frozen=True)
+class _TradeSeries:
+    """
+    Column (SoA) view of closed trades.
+
+    Built once per calculation so each risk algorithm iterates plain
+    float/int lists instead of re-walking per-trade dicts.
+    Timestamps are converted once to integer UTC epoch microseconds and
+    sessions to their index in _SESSIONS (-1 when unknown).
+    Row order is preserved from the input (newest first, as query_trades returns).
+    """
+
+    pnl: List[float]
+    ts_us: List[int]
+    session_idx: List[int]
+
+    @classmethod
+    def from_rows(
+        cls, rows: List[dict], cutoff_us: Optional[int] = None
+    ) -> "_TradeSeries":
+        """
+        Keep closed trades (pnl set) at or after cutoff_us, column by column.
+
+        rows come from Database.query_trades_projected with timestamp (ISO
+        string), pnl and market_context only, so no TradeRecord is built.
+        """
+        pnl: List[float] = []
+        ts_us: List[int] = []
+        session_idx: List[int] = []
+        for row in rows:
+            if row["pnl"] is None:
+                continue
+            ts = row["timestamp"]
+            if isinstance(ts, str):
+                # fromisoformat only accepts a trailing "Z" from Python 3.11
+                ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+            us = _to_epoch_us(ts)
+            if cutoff_us is not None and us < cutoff_us:
+                continue
+            pnl.append(float(row["pnl"]))
+            ts_us.append(us)
+            session = (row["market_context"] or {}).get("session")
+            session_idx.append(_SESSION_INDEX.get(session.lower(), -1) if session else -1)
+        return cls(pnl=pnl, ts_us=ts_us, session_idx=session_idx)
+
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+
+class _RiskMetrics(NamedTuple):
+    """Outputs of the 5 risk algorithms from one pass over the trades."""
+
+    kelly: float
+    dd_scale: float
+    session_adjustments: Dict[str, float]
+    consec_status: RiskStatus
+    daily_status: RiskStatus
+
+
+def _risk_pass(
+    pnls: List[float],
+    ts_us: List[int],
+    session_idx: List[int],
+    today_day: int,
+) -> tuple:
+    """
+    Single pass over closed trades producing the raw risk accumulators.
+
+    Pure function over primitive columns (no model or ``self`` access) so the
+    whole loop runs on local variables. Columns must already be
+    newest-first (the order ``query_history`` returns), so the
+    consecutive-loss streak is counted from the head while the other
+    accumulators update, without re-sorting.
+
+    Returns (n, n_wins, n_losses, sum_wins, sum_losses, max_dd_pct,
+    session_n, session_wins, streak, daily_loss); the session counts are
+    lists indexed like _SESSIONS.
+    """
+    n_wins = n_losses = 0
+    sum_wins = sum_losses = 0.0
+    # Assume $10,000 starting equity for DD% calculation
+    equity_base = 10000.0
+    cumulative = peak = max_dd_pct = 0.0
+    session_n = [0] * len(_SESSIONS)
+    session_wins = [0] * len(_SESSIONS)
+    streak = 0
+    streak_open = True
+    daily_loss = 0.0
+
+    for i in range(len(pnls)):
+        pnl = pnls[i]
+
+        if pnl > 0:
+            n_wins += 1
+            sum_wins += pnl
+        elif pnl < 0:
+            n_losses += 1
+            sum_losses += pnl
+
+        cumulative += pnl
+        equity = equity_base + cumulative
+        if equity > peak:
+            peak = equity
+        if peak > 0:
+            dd_pct = (peak - equity) / peak
+            if dd_pct > max_dd_pct:
+                max_dd_pct = dd_pct
+
+        s = session_idx[i]
+        if s >= 0:
+            session_n[s] += 1
+            if pnl > 0:
+                session_wins[s] += 1
+
+        if streak_open:
+            if pnl < 0:
+                streak += 1
+            else:
+                streak_open = False
+
+        if pnl < 0 and ts_us[i] // _US_PER_DAY == today_day:
+            daily_loss -= pnl
+
+    return (len(pnls), n_wins, n_losses, sum_wins, sum_losses, max_dd_pct,
+            session_n, session_wins, streak, daily_loss)
+
 
 class AdaptiveRisk:
     """
@@ -54,11 +250,24 @@ class AdaptiveRisk:
         daily_loss_limit: float = 500.0,
         max_lot_size: float = 0.1,
     ):
-        self.journal = journal or TradeJournal()
-        self.state_manager = state_manager or StateManager()
+        # Journal and state share one Database so a single set of connections
+        # (and one schema init) serves both the history read and constraint load.
+        if journal is None:
+            journal = TradeJournal(db=state_manager.db if state_manager else None)
+        self.journal = journal
+        self.state_manager = state_manager or StateManager(db=journal.db)
         self._consecutive_loss_limit = consecutive_loss_limit
         self._daily_loss_limit = daily_loss_limit
         self._max_lot_size = max_lot_size
+        # Safe defaults with this instance's limits baked in, built once.
+        self._safe_defaults = _SAFE_DEFAULTS.model_copy(update={
+            "max_lot_size": max_lot_size,
+            "daily_loss_limit": daily_loss_limit,
+            "consecutive_loss_limit": consecutive_loss_limit,
+        })
+        # Last constraints persisted through this instance, per agent, so
+        # check_trade can skip the state load + model validation.
+        self._constraints_cache: Dict[str, RiskConstraints] = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -76,18 +285,21 @@ class AdaptiveRisk:
         Returns safe defaults if < MIN_TRADES closed trades.
         Persists result to StateManager.
         """
-        closed = self._get_closed_trades(symbol=symbol, strategy=strategy)
+        # One clock read per calculation: lookback cutoff, "today" for the
+        # daily-loss check and updated_at all derive from it.
+        now = datetime.now(timezone.utc)
+        closed = self._get_closed_trades(symbol=symbol, strategy=strategy, now=now)
 
         if len(closed) < self.MIN_TRADES:
-            constraints = _SAFE_DEFAULTS.model_copy()
-            constraints.max_lot_size = self._max_lot_size
-            constraints.daily_loss_limit = self._daily_loss_limit
-            constraints.consecutive_loss_limit = self._consecutive_loss_limit
-            constraints.updated_at = datetime.now(timezone.utc)
+            defaults = self._safe_defaults
+            constraints = defaults.model_copy(update={
+                "session_adjustments": dict(defaults.session_adjustments),
+                "updated_at": now,
+            })
             self._persist(agent_id, constraints)
             return constraints
 
-        constraints = self._combine_constraints(closed)
+        constraints = self._combine_constraints(closed, now=now)
         self._persist(agent_id, constraints)
         return constraints
 
@@ -95,14 +307,22 @@ class AdaptiveRisk:
         """
         Return stored constraints. Falls back to safe defaults
         if nothing persisted yet.
+
+        Constraints persisted by this instance are served from memory;
+        the returned object is shared and should be treated as read-only.
+        A write by another instance is seen after this one recalculates.
         """
+        cached = self._constraints_cache.get(agent_id)
+        if cached is not None:
+            return cached
+
         state = self.state_manager.load_state(agent_id)
         raw = state.risk_constraints
 
         if not raw:
             return _SAFE_DEFAULTS.model_copy()
 
-        return RiskConstraints(**raw)
+        return _constraints_from_state(raw)
 
     def check_trade(
         self,
@@ -117,6 +337,17 @@ class AdaptiveRisk:
         """
         constraints = self.get_constraints(agent_id)
         lot = proposal.lot_size
+
+        # Fast path: nothing below can change an in-range lot. Decided from
+        # the constraints themselves, so it can never disagree with them.
+        if 0.01 <= lot <= constraints.max_lot_size and _never_reduces(constraints):
+            return TradeCheckResult(
+                approved=True,
+                adjusted_lot_size=lot,
+                reasons=[],
+                constraints_applied=constraints,
+            )
+
         reasons: List[str] = []
 
         # 1. Status gate
@@ -176,42 +407,53 @@ class AdaptiveRisk:
         self,
         symbol: Optional[str] = None,
         strategy: Optional[str] = None,
-    ) -> List[TradeRecord]:
-        """Get closed trades within lookback window."""
-        trades = self.journal.query_history(
-            symbol=symbol, strategy=strategy, limit=1000
+        now: Optional[datetime] = None,
+    ) -> _TradeSeries:
+        """Get closed trades within lookback window as a column view."""
+        # Same 1000 newest rows as journal.query_history, minus the columns
+        # and TradeRecord validation the risk pass has no use for
+        rows = self.journal.db.query_trades_projected(
+            ("timestamp", "pnl", "market_context"),
+            symbol=symbol, strategy=strategy, limit=1000,
         )
-        cutoff = datetime.now(timezone.utc) - timedelta(days=self.LOOKBACK_DAYS)
-        closed = []
-        for t in trades:
-            if t.pnl is None:
-                continue
-            ts = t.timestamp
-            if isinstance(ts, str):
-                ts = datetime.fromisoformat(ts)
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            if ts >= cutoff:
-                closed.append(t)
-        return closed
-
-    def _calculate_kelly(self, trades: List[TradeRecord]) -> float:
+        now_us = _to_epoch_us(now or datetime.now(timezone.utc))
+        cutoff_us = now_us - self.LOOKBACK_DAYS * _US_PER_DAY
+        return _TradeSeries.from_rows(rows, cutoff_us=cutoff_us)
+
+    def _compute_all(
+        self, series: _TradeSeries, now: Optional[datetime] = None
+    ) -> _RiskMetrics:
+        """Run all 5 risk algorithms from one _risk_pass over the trades."""
+        today_day = _to_epoch_us(now or datetime.now(timezone.utc)) // _US_PER_DAY
+        (n, n_wins, n_losses, sum_wins, sum_losses, max_dd_pct,
+         session_n, session_wins, streak, daily_loss) = _risk_pass(
+            series.pnl, series.ts_us, series.session_idx, today_day
+        )
+        return _RiskMetrics(
+            kelly=self._kelly_from_totals(n, n_wins, n_losses, sum_wins, sum_losses),
+            dd_scale=self._drawdown_scale_from(max_dd_pct),
+            session_adjustments=self._session_adjustments_from(session_n, session_wins),
+            consec_status=self._consecutive_loss_status(streak),
+            daily_status=self._daily_loss_status(daily_loss),
+        )
+
+    @staticmethod
+    def _kelly_from_totals(
+        n: int, n_wins: int, n_losses: int, sum_wins: float, sum_losses: float
+    ) -> float:
         """
         Quarter-Kelly criterion.
 
         f* = (p*b - q) / b  where p=win_rate, b=avg_win/avg_loss, q=1-p
         Returns 0.0 if no edge or insufficient data. Max 0.25.
         """
-        wins = [t for t in trades if t.pnl is not None and t.pnl > 0]
-        losses = [t for t in trades if t.pnl is not None and t.pnl < 0]
-
-        if len(wins) < 2 or len(losses) < 2:
+        if n_wins < 2 or n_losses < 2:
             return 0.0
 
-        p = len(wins) / len(trades)
+        p = n_wins / n
         q = 1 - p
-        avg_win = sum(t.pnl for t in wins) / len(wins)  # type: ignore[arg-type]
-        avg_loss = abs(sum(t.pnl for t in losses) / len(losses))  # type: ignore[arg-type]
+        avg_win = sum_wins / n_wins
+        avg_loss = abs(sum_losses / n_losses)
 
         if avg_loss == 0:
             return 0.0
@@ -225,69 +467,37 @@ class AdaptiveRisk:
         # Quarter-Kelly, capped at 25%
         return min(kelly / 4, 0.25)
 
-    def _calculate_drawdown_scale(self, trades: List[TradeRecord]) -> float:
+    @staticmethod
+    def _drawdown_scale_from(max_dd_pct: float) -> float:
         """
         Scale factor based on running drawdown.
 
         DD > 10% -> 0.5x, DD > 5% -> 0.75x, else 1.0x.
         Uses cumulative PnL as proxy equity curve.
         """
-        if not trades:
-            return 1.0
-
-        cumulative = 0.0
-        peak = 0.0
-        max_dd_pct = 0.0
-
-        # Assume $10,000 starting equity for DD% calculation
-        equity_base = 10000.0
-
-        for t in trades:
-            cumulative += (t.pnl or 0.0)
-            equity = equity_base + cumulative
-            if equity > peak:
-                peak = equity
-            if peak > 0:
-                dd_pct = (peak - equity) / peak
-                if dd_pct > max_dd_pct:
-                    max_dd_pct = dd_pct
-
         if max_dd_pct > 0.10:
             return 0.5
         if max_dd_pct > 0.05:
             return 0.75
         return 1.0
 
-    def _calculate_session_adjustments(
-        self, trades: List[TradeRecord]
+    @staticmethod
+    def _session_adjustments_from(
+        session_n: List[int], session_wins: List[int]
     ) -> Dict[str, float]:
         """
         Per-session lot multiplier based on win rate.
 
+        Counts are indexed like _SESSIONS.
         Win rate < 40% -> 0.5x, < 50% -> 0.75x, else 1.0.
         Insufficient data (< 3 trades) -> 0.75 (conservative).
         """
-        session_map: Dict[str, List[TradeRecord]] = {
-            "asian": [], "london": [], "newyork": [],
-        }
-
-        for t in trades:
-            session = None
-            if t.market_context and t.market_context.session:
-                session = t.market_context.session.lower()
-            if session in session_map:
-                session_map[session].append(t)
-
         adjustments: Dict[str, float] = {}
-        for session, session_trades in session_map.items():
-            if len(session_trades) < 3:
+        for session, n, wins in zip(_SESSIONS, session_n, session_wins):
+            if n < 3:
                 adjustments[session] = 0.75
                 continue
-            wins = sum(
-                1 for st in session_trades
-                if st.pnl is not None and st.pnl > 0
-            )
-            wr = wins / len(session_trades)
+            wr = wins / n
             if wr < 0.40:
                 adjustments[session] = 0.5
             elif wr < 0.50:
@@ -297,65 +507,54 @@ class AdaptiveRisk:
 
         return adjustments
 
-    def _check_consecutive_losses(
-        self, trades: List[TradeRecord]
-    ) -> RiskStatus:
+    def _consecutive_loss_status(self, streak: int) -> RiskStatus:
         """
         Check consecutive loss streak.
 
         >= limit -> STOPPED, >= limit-1 -> REDUCED, else ACTIVE.
-        Trades sorted newest-first; streak resets on any win.
+        Streak is counted newest-first and resets on any win.
         """
-        # Sort by timestamp descending (most recent first)
-        sorted_trades = sorted(
-            trades,
-            key=lambda t: t.timestamp if isinstance(t.timestamp, str) else t.timestamp.isoformat(),
-            reverse=True,
-        )
-
-        streak = 0
-        for t in sorted_trades:
-            if t.pnl is not None and t.pnl < 0:
-                streak += 1
-            else:
-                break
-
         if streak >= self._consecutive_loss_limit:
             return RiskStatus.STOPPED
         if streak >= self._consecutive_loss_limit - 1:
             return RiskStatus.REDUCED
         return RiskStatus.ACTIVE
 
-    def _check_daily_loss(self, trades: List[TradeRecord]) -> RiskStatus:
+    def _daily_loss_status(self, daily_loss: float) -> RiskStatus:
         """
         Check if today's realised loss exceeds daily limit.
 
         Exceeded -> STOPPED, >= 80% -> REDUCED, else ACTIVE.
         """
-        today = datetime.now(timezone.utc).date()
-        daily_loss = 0.0
-
-        for t in trades:
-            ts = t.timestamp
-            if isinstance(ts, str):
-                ts = datetime.fromisoformat(ts)
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            if ts.date() == today and t.pnl is not None and t.pnl < 0:
-                daily_loss += abs(t.pnl)
-
         if daily_loss >= self._daily_loss_limit:
             return RiskStatus.STOPPED
         if daily_loss >= self._daily_loss_limit * 0.8:
             return RiskStatus.REDUCED
         return RiskStatus.ACTIVE
 
+    # Per-algorithm entry points, kept as thin views over the fused pass.
+
+    def _calculate_kelly(self, series: _TradeSeries) -> float:
+        return self._compute_all(series).kelly
+
+    def _calculate_drawdown_scale(self, series: _TradeSeries) -> float:
+        return self._compute_all(series).dd_scale
+
+    def _calculate_session_adjustments(self, series: _TradeSeries) -> Dict[str, float]:
+        return self._compute_all(series).session_adjustments
+
+    def _check_consecutive_losses(self, series: _TradeSeries) -> RiskStatus:
+        return self._compute_all(series).consec_status
+
+    def _check_daily_loss(self, series: _TradeSeries) -> RiskStatus:
+        return self._compute_all(series).daily_status
+
     # ------------------------------------------------------------------
     # Private: Combine & persist
     # ------------------------------------------------------------------
 
     def _combine_constraints(
-        self, trades: List[TradeRecord]
+        self, series: _TradeSeries, now: Optional[datetime] = None
     ) -> RiskConstraints:
         """
         Run all 5 algorithms and merge into a single RiskConstraints.
@@ -363,11 +562,11 @@ class AdaptiveRisk:
         Worst-status-wins; REDUCED applies extra 0.5x scale.
         Kelly -> risk_per_trade_pct (0.5%-5% range).
         """
-        kelly = self._calculate_kelly(trades)
-        dd_scale = self._calculate_drawdown_scale(trades)
-        session_adj = self._calculate_session_adjustments(trades)
-        consec_status = self._check_consecutive_losses(trades)
-        daily_status = self._check_daily_loss(trades)
+        if now is None:
+            now = datetime.now(timezone.utc)
+        kelly, dd_scale, session_adj, consec_status, daily_status = self._compute_all(
+            series, now=now
+        )
 
         # Worst status wins
         status_priority = {
@@ -420,11 +619,24 @@ class AdaptiveRisk:
             kelly_fraction=round(kelly, 4),
             status=worst,
             reason=reason_text,
-            updated_at=datetime.now(timezone.utc),
+            updated_at=now,
         )
 
     def _persist(self, agent_id: str, constraints: RiskConstraints) -> None:
-        """Save constraints to StateManager."""
-        self.state_manager.update_risk_constraints(
-            agent_id, constraints.model_dump(mode="json")
-        )
+        """
+        Save constraints to StateManager and refresh the in-memory copy.
+
+        Skipped when the content matches what is stored for the agent, so
+        the stored updated_at marks the last real change. Compared against
+        the stored state rather than this instance's last write: other
+        processes (API server, MCP server, scripts) share the DB file.
+        """
+        data = _constraints_to_state(constraints)
+        stored = self.state_manager.load_state(agent_id).risk_constraints
+        if stored and all(stored.get(f) == data[f] for f in _CONTENT_FIELDS):
+            self._constraints_cache[agent_id] = _constraints_from_state(stored)
+            return
+        self.state_manager.update_risk_constraints(agent_id, data)
+        self._constraints_cache[agent_id] = constraints.model_copy(update={
+            "session_adjustments": dict(constraints.session_adjustments),
+        })
@@ -7,11 +7,32 @@ and bulk-imports them into tradememory SQLite database.
 All imported trades have source="backtest" in their reasoning field.
 """
 
+import io
 import os
 import re
-from datetime import datetime, timezone
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_DEAL_ROW_RE = re.compile(r'<tr[^>]*>(.*?)</tr>', re.DOTALL)
+_TD_RE = re.compile(r'<td[^>]*>([^<]*)</td>')
+# MT5 deal time "2024.01.03 15:15:00"; same fields strptime's
+# "%Y.%m.%d %H:%M:%S" accepts, without its per-call format parsing
+_DEAL_TIME_RE = re.compile(r'(\d{4})\.(\d{1,2})\.(\d{1,2}) (\d{1,2}):(\d{1,2}):(\d{1,2})')
+
+
+def _parse_deal_time(value: str) -> datetime:
+    """Parse an MT5 deal timestamp as UTC. Raises ValueError if malformed."""
+    m = _DEAL_TIME_RE.fullmatch(value)
+    if m is None:
+        raise ValueError(f"bad deal time: {value!r}")
+    year, month, day, hour, minute, second = map(int, m.groups())
+    return datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
 
 
 def classify_session(hour: int) -> str:
@@ -24,6 +45,39 @@ def classify_session(hour: int) -> str:
         return "newyork"
 
 
+# classify_session() for every hour of the day, indexed by datetime.hour
+_SESSION_BY_HOUR = tuple(classify_session(h) for h in range(24))
+_ONE_MINUTE = timedelta(minutes=1)
+
+
+_READ_CHUNK_CHARS = 1 << 20
+
+
+def _iter_table_rows(report_path: str) -> Iterator[str]:
+    """
+    Yield the inner HTML of each <tr> in a UTF-16LE report.
+
+    The file is decoded in fixed-size chunks and only complete rows are
+    scanned, so memory stays bounded by the chunk size rather than the
+    whole report.
+    """
+    with open(report_path, 'rb') as fh:
+        text = io.TextIOWrapper(fh, encoding='utf-16-le', newline='')
+        pending = ''
+        while True:
+            chunk = text.read(_READ_CHUNK_CHARS)
+            if not chunk:
+                break
+            pending += chunk
+            end = pending.rfind('</tr>')
+            if end < 0:
+                continue
+            end += len('</tr>')
+            for row_match in _DEAL_ROW_RE.finditer(pending, 0, end):
+                yield row_match.group(1)
+            pending = pending[end:]
+
+
 def parse_mt5_report(report_path: str) -> List[Dict[str, Any]]:
     """
     Parse an MT5 Strategy Tester HTML report and extract completed trades.
@@ -38,20 +92,18 @@ def parse_mt5_report(report_path: str) -> List[Dict[str, Any]]:
     if not os.path.exists(report_path):
         return []
 
-    content = Path(report_path).read_text(encoding='utf-16-le')
-    lines = content.split('\n')
-
     # Parse deal rows: <tr bgcolor=...><td>...</td>...<td>in/out</td>...
-    entries = []  # pending entry deals (FIFO queue per direction)
+    # Pending entry deals (FIFO queue) as (time, direction, volume, price, symbol)
+    entries = deque()
     trades = []
 
-    for line in lines:
+    for row in _iter_table_rows(report_path):
         # Only process deal rows with in/out direction
-        if '<td>in</td>' not in line and '<td>out</td>' not in line:
+        if '<td>in</td>' not in row and '<td>out</td>' not in row:
             continue
 
         # Extract all <td> values
-        td_values = re.findall(r'<td[^>]*>([^<]*)</td>', line)
+        td_values = _TD_RE.findall(row)
         if len(td_values) < 12:
             continue
 
@@ -63,11 +115,9 @@ def parse_mt5_report(report_path: str) -> List[Dict[str, Any]]:
         in_out = td_values[4]         # in or out
         volume_str = td_values[5]
         price_str = td_values[6]
-        profit_str = td_values[10].replace(' ', '')  # "10 000.00" → "10000.00"
 
         try:
-            deal_time = datetime.strptime(deal_time_str, "%Y.%m.%d %H:%M:%S")
-            deal_time = deal_time.replace(tzinfo=timezone.utc)
+            deal_time = _parse_deal_time(deal_time_str)
             volume = float(volume_str)
             price = float(price_str)
         except (ValueError, IndexError):
@@ -76,33 +126,28 @@ def parse_mt5_report(report_path: str) -> List[Dict[str, Any]]:
         if in_out == 'in':
             # Entry deal
             direction = 'long' if deal_type == 'buy' else 'short'
-            entries.append({
-                'time': deal_time,
-                'direction': direction,
-                'volume': volume,
-                'price': price,
-                'symbol': td_values[2]
-            })
+            entries.append((deal_time, direction, volume, price, td_values[2]))
         elif in_out == 'out' and entries:
             # Exit deal - match with first pending entry
+            # Profit only matters on exits: "10 000.00" → "10000.00"
             try:
-                pnl = float(profit_str)
+                pnl = float(td_values[10].replace(' ', ''))
             except ValueError:
                 pnl = 0.0
 
             # Pop first entry (FIFO matching)
-            entry = entries.pop(0)
+            entry_time, direction, entry_volume, entry_price, symbol = entries.popleft()
 
-            # Calculate hold duration in minutes
-            hold_minutes = int((deal_time - entry['time']).total_seconds() / 60)
+            # Calculate hold duration in whole minutes
+            hold_minutes = (deal_time - entry_time) // _ONE_MINUTE
 
             trades.append({
-                'entry_time': entry['time'],
+                'entry_time': entry_time,
                 'exit_time': deal_time,
-                'symbol': entry['symbol'],
-                'direction': entry['direction'],
-                'volume': entry['volume'],
-                'entry_price': entry['price'],
+                'symbol': symbol,
+                'direction': direction,
+                'volume': entry_volume,
+                'entry_price': entry_price,
                 'exit_price': price,
                 'pnl': pnl,
                 'hold_duration_min': max(hold_minutes, 1),
@@ -111,32 +156,44 @@ def parse_mt5_report(report_path: str) -> List[Dict[str, Any]]:
     return trades
 
 
+STRATEGY_PREFIXES = {'VB': 'VolBreakout', 'IM': 'IntradayMomentum',
+                     'PB': 'PullbackEntry', 'MR': 'MeanReversion'}
+
+
+_VARIANT_KEYS = ('strategy', 'symbol', 'direction_filter', 'params', 'tag')
+
+
+@lru_cache(maxsize=4096)
+def _variant_fields(tag: str) -> Tuple[str, str, str, str, str]:
+    """Memoized field values for parse_variant_tag, in _VARIANT_KEYS order."""
+    parts = tag.split('_')
+    return (
+        STRATEGY_PREFIXES.get(parts[0], parts[0]),
+        parts[1] if len(parts) > 1 else 'UNKNOWN',
+        parts[2] if len(parts) > 2 else 'BOTH',
+        '_'.join(parts[3:]) if len(parts) > 3 else '',
+        tag,
+    )
+
+
 def parse_variant_tag(tag: str) -> Dict[str, str]:
     """
     Parse a variant tag into strategy, symbol, direction, and params.
 
+    Parsing is memoized per tag; each call returns a fresh dict.
+
     Examples:
         VB_XAUUSD_BUY_RR3_BUF0.1 → {strategy: VolBreakout, symbol: XAUUSD, ...}
         IM_EURUSD_BOTH_RR2.5_TH0.55 → {strategy: IntradayMomentum, ...}
     """
-    parts = tag.split('_')
-    strategy_map = {'VB': 'VolBreakout', 'IM': 'IntradayMomentum',
-                    'PB': 'PullbackEntry', 'MR': 'MeanReversion'}
-
-    result = {
-        'strategy': strategy_map.get(parts[0], parts[0]),
-        'symbol': parts[1] if len(parts) > 1 else 'UNKNOWN',
-        'direction_filter': parts[2] if len(parts) > 2 else 'BOTH',
-        'params': '_'.join(parts[3:]) if len(parts) > 3 else '',
-        'tag': tag,
-    }
-    return result
+    return dict(zip(_VARIANT_KEYS, _variant_fields(tag)))
 
 
 def build_trade_records(
     trades: List[Dict[str, Any]],
     variant_tag: str,
-    backtest_params: Optional[Dict[str, str]] = None
+    backtest_params: Optional[Dict[str, str]] = None,
+    variant_info: Optional[Dict[str, str]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Convert parsed trades into tradememory TradeRecord format.
@@ -145,18 +202,27 @@ def build_trade_records(
         trades: Parsed trades from parse_mt5_report()
         variant_tag: The variant identifier (e.g., VB_XAUUSD_BUY_RR3_BUF0.1)
         backtest_params: Optional dict of backtest parameters
+        variant_info: parse_variant_tag(variant_tag), if the caller already has it
 
     Returns:
         List of dicts ready for db.insert_trade()
     """
-    variant_info = parse_variant_tag(variant_tag)
+    if variant_info is None:
+        variant_info = parse_variant_tag(variant_tag)
     records = []
 
+    # Per-variant constants, hoisted out of the per-trade loop
+    strategy = variant_info['strategy']
+    reasoning_prefix = f"Backtest: {strategy} | {variant_info['params']} | "
+    base_tags = ['backtest', strategy, variant_info['symbol'], variant_info['direction_filter']]
+    params_tag = f"params:{variant_info['params']}" if backtest_params else None
+    exit_reasoning = f"Backtest exit | source=backtest | variant={variant_tag}"
+
     for i, trade in enumerate(trades):
         trade_id = f"BT-{variant_tag}-{i+1:04d}"
 
         # Market context
-        session = classify_session(trade['entry_time'].hour)
+        session = _SESSION_BY_HOUR[trade['entry_time'].hour]
         market_ctx = {
             'price': trade['entry_price'],
             'session': session,
@@ -164,22 +230,12 @@ def build_trade_records(
         }
 
         # Build reasoning with source tag
-        reasoning = (
-            f"Backtest: {variant_info['strategy']} | "
-            f"{variant_info['params']} | "
-            f"{trade['direction']} entry at {session} session"
-        )
+        reasoning = f"{reasoning_prefix}{trade['direction']} entry at {session} session"
 
         # Tags for filtering
-        tags = [
-            'backtest',
-            variant_info['strategy'],
-            variant_info['symbol'],
-            variant_info['direction_filter'],
-            session,
-        ]
-        if backtest_params:
-            tags.append(f"params:{variant_info['params']}")
+        tags = base_tags + [session]
+        if params_tag:
+            tags.append(params_tag)
 
         record = {
             'id': trade_id,
@@ -187,7 +243,7 @@ def build_trade_records(
             'symbol': trade['symbol'],
             'direction': trade['direction'],
             'lot_size': trade['volume'],
-            'strategy': variant_info['strategy'],
+            'strategy': strategy,
             'confidence': 0.5,  # No real confidence for backtests
             'reasoning': reasoning,
             'market_context': market_ctx,
@@ -197,7 +253,7 @@ def build_trade_records(
             'pnl': trade['pnl'],
             'pnl_r': None,
             'hold_duration': trade['hold_duration_min'],
-            'exit_reasoning': f"Backtest exit | source=backtest | variant={variant_tag}",
+            'exit_reasoning': exit_reasoning,
             'slippage': None,
             'execution_quality': None,
             'lessons': None,
@@ -209,10 +265,25 @@ def build_trade_records(
     return records
 
 
+def _parse_and_build(
+    report_path: str,
+) -> Tuple[str, Dict[str, str], List[Dict[str, Any]]]:
+    """Parse one report into TradeRecords. Runs in a worker process."""
+    # Extract variant tag from filename: VB_XAUUSD_BUY_RR3_BUF0.1_report.htm
+    tag = Path(report_path).stem.replace('_report', '')
+    trades = parse_mt5_report(report_path)
+    if not trades:
+        return tag, {}, []
+    variant_info = parse_variant_tag(tag)
+    return tag, variant_info, build_trade_records(trades, tag, variant_info=variant_info)
+
+
 def import_batch(
     report_dir: str,
     db_path: str,
-    manifest_path: Optional[str] = None
+    manifest_path: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    verbose: bool = False,
 ) -> Dict[str, Any]:
     """
     Batch import all backtest reports from a directory into tradememory.
@@ -221,6 +292,8 @@ def import_batch(
         report_dir: Directory containing *_report.htm files
         db_path: Path to tradememory SQLite database
         manifest_path: Optional manifest.csv for variant metadata
+        max_workers: Parser processes (default: one per CPU; 1 parses in-process)
+        verbose: Print one line per imported report once the import finishes
 
     Returns:
         Import statistics dict
@@ -244,45 +317,53 @@ def import_batch(
     report_files = sorted(Path(report_dir).glob('*_report.htm'))
     stats['total_reports'] = len(report_files)
 
-    for report_path in report_files:
-        # Extract variant tag from filename: VB_XAUUSD_BUY_RR3_BUF0.1_report.htm
-        tag = report_path.stem.replace('_report', '')
-
-        # Parse trades
-        trades = parse_mt5_report(str(report_path))
-        if not trades:
-            stats['empty_reports'] += 1
-            continue
-
-        # Build TradeRecords
-        records = build_trade_records(trades, tag)
-        stats['total_trades'] += len(records)
-
-        # Track by strategy/symbol
-        variant_info = parse_variant_tag(tag)
-        strategy = variant_info['strategy']
-        symbol = variant_info['symbol']
-        stats['by_strategy'][strategy] = stats['by_strategy'].get(strategy, 0) + len(records)
-        stats['by_symbol'][symbol] = stats['by_symbol'].get(symbol, 0) + len(records)
-
-        # Batch insert
-        batch_count = 0
-        for record in records:
-            success = db.insert_trade(record)
-            if success:
-                stats['imported'] += 1
-                batch_count += 1
-            else:
-                stats['skipped'] += 1
-
-        print(f"  {tag}: {len(trades)} trades parsed, {batch_count} imported")
+    # Parsing is CPU-bound and independent per file, so it runs in worker
+    # processes; SQLite writes stay in this process.
+    if max_workers is None:
+        cpu_count = getattr(os, 'process_cpu_count', os.cpu_count)
+        max_workers = cpu_count() or 1
+    paths = [str(p) for p in report_files]
+
+    report_lines = []
+
+    with ExitStack() as stack:
+        # Consumed lazily and in order: each report's records are inserted
+        # and dropped before the next is pulled, not held all at once
+        if max_workers <= 1 or len(paths) <= 1:
+            parsed = map(_parse_and_build, paths)
+        else:
+            ex = stack.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+            parsed = ex.map(_parse_and_build, paths, chunksize=4)
+
+        # All reports go in under one transaction; duplicates are ignored
+        with db.get_connection():
+            for tag, variant_info, records in parsed:
+                if not records:
+                    stats['empty_reports'] += 1
+                    continue
+
+                n = len(records)
+                stats['total_trades'] += n
+
+                # Track by strategy/symbol
+                strategy = variant_info['strategy']
+                symbol = variant_info['symbol']
+                stats['by_strategy'][strategy] = stats['by_strategy'].get(strategy, 0) + n
+                stats['by_symbol'][symbol] = stats['by_symbol'].get(symbol, 0) + n
+
+                batch_count = db.insert_trades_bulk(records)
+                stats['imported'] += batch_count
+                stats['skipped'] += n - batch_count
+
+                report_lines.append(f"  {tag}: {n} trades parsed, {batch_count} imported")
+
+    if verbose and report_lines:
+        sys.stdout.write("\n".join(report_lines) + "\n")
 
     return stats
 
 
 if __name__ == '__main__':
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage: python -m tradememory.backtest_importer <report_dir> [db_path]")
         print("  report_dir: Directory with *_report.htm files")
@@ -296,7 +377,7 @@ if __name__ == '__main__':
     print(f"Database: {db_path}")
     print()
 
-    stats = import_batch(report_dir, db_path)
+    stats = import_batch(report_dir, db_path, verbose=True)
 
     print()
     print("=== IMPORT SUMMARY ===")
@@ -3,21 +3,473 @@ SQLite database operations for TradeMemory Protocol.
 Single file database, no ORM (per CIO directive).
 """
 
+import itertools
 import json
 import logging
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set
 
 from .exceptions import TradeMemoryDBError
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS  # int keys -> str, as json does
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=_ORJSON_OPTS).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    # orjson not installed - stdlib json stores the same data
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Bind datetimes as ISO-8601 text (the format every TEXT timestamp column
+# holds), so write paths need no per-value isinstance/isoformat step.
+# Also replaces the stdlib default adapter deprecated in Python 3.12.
+sqlite3.register_adapter(datetime, datetime.isoformat)
+
+
+# Applied on every connection. journal_mode=WAL is persistent in the file,
+# so it is set once in _init_schema instead.
+CONNECTION_PRAGMAS = (
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-65536",
+    "mmap_size=268435456",
+)
+
+# Full schema, run as one script by Database._init_schema
+_SCHEMA_SQL = """
+-- Trade records table
+CREATE TABLE IF NOT EXISTS trade_records (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    lot_size REAL NOT NULL,
+    strategy TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    reasoning TEXT NOT NULL,
+    market_context TEXT NOT NULL,
+    trade_references TEXT NOT NULL,
+    exit_timestamp TEXT,
+    exit_price REAL,
+    pnl REAL,
+    pnl_r REAL,
+    hold_duration INTEGER,
+    exit_reasoning TEXT,
+    slippage REAL,
+    execution_quality REAL,
+    lessons TEXT,
+    tags TEXT,
+    grade TEXT
+);
+
+-- Session state table
+CREATE TABLE IF NOT EXISTS session_state (
+    agent_id TEXT PRIMARY KEY,
+    last_active TEXT NOT NULL,
+    warm_memory TEXT NOT NULL,
+    active_positions TEXT NOT NULL,
+    risk_constraints TEXT NOT NULL
+);
+
+-- Indexes for common queries
+CREATE INDEX IF NOT EXISTS idx_timestamp
+ON trade_records(timestamp DESC);
+-- Superseded by idx_trades_strategy_ts, which also serves strategy lookups
+DROP INDEX IF EXISTS idx_strategy;
+-- query_trades filters: ORDER BY timestamp DESC walks these
+-- directly instead of sorting the matching rows
+CREATE INDEX IF NOT EXISTS idx_trades_strategy_symbol_ts
+ON trade_records(strategy, symbol, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_trades_strategy_ts
+ON trade_records(strategy, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_trades_symbol_ts
+ON trade_records(symbol, timestamp DESC);
+-- Open positions only: stays as small as the set of open trades
+CREATE INDEX IF NOT EXISTS idx_trades_open_ts
+ON trade_records(timestamp DESC) WHERE exit_timestamp IS NULL;
+
+-- Patterns table (L2 layer)
+CREATE TABLE IF NOT EXISTS patterns (
+    pattern_id TEXT PRIMARY KEY,
+    pattern_type TEXT NOT NULL,
+    description TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    sample_size INTEGER NOT NULL,
+    date_range TEXT NOT NULL,
+    strategy TEXT,
+    symbol TEXT,
+    metrics TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT 'backtest_auto',
+    validation_status TEXT NOT NULL DEFAULT 'IN_SAMPLE',
+    discovered_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_patterns_strategy_symbol
+ON patterns(strategy, symbol);
+CREATE INDEX IF NOT EXISTS idx_patterns_type
+ON patterns(pattern_type);
+
+-- Strategy adjustments table (L3 layer)
+CREATE TABLE IF NOT EXISTS strategy_adjustments (
+    adjustment_id TEXT PRIMARY KEY,
+    adjustment_type TEXT NOT NULL,
+    parameter TEXT NOT NULL,
+    old_value TEXT NOT NULL,
+    new_value TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    source_pattern_id TEXT,
+    confidence REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'proposed',
+    created_at TEXT NOT NULL,
+    applied_at TEXT,
+    FOREIGN KEY (source_pattern_id) REFERENCES patterns(pattern_id)
+);
+CREATE INDEX IF NOT EXISTS idx_adjustments_status
+ON strategy_adjustments(status);
+CREATE INDEX IF NOT EXISTS idx_adjustments_type
+ON strategy_adjustments(adjustment_type);
+
+-- ========== OWM Tables ==========
+
+-- Episodic Memory (Section 2.1)
+CREATE TABLE IF NOT EXISTS episodic_memory (
+    id TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    context_json TEXT NOT NULL,
+    context_regime TEXT,
+    context_volatility_regime TEXT,
+    context_session TEXT,
+    context_atr_d1 REAL,
+    context_atr_h1 REAL,
+    strategy TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    entry_price REAL NOT NULL,
+    lot_size REAL,
+    exit_price REAL,
+    pnl REAL,
+    pnl_r REAL,
+    hold_duration_seconds INTEGER,
+    max_adverse_excursion REAL,
+    reflection TEXT,
+    confidence REAL DEFAULT 0.5,
+    tags TEXT,
+    retrieval_strength REAL DEFAULT 1.0,
+    retrieval_count INTEGER DEFAULT 0,
+    last_retrieved TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_episodic_regime
+ON episodic_memory(context_regime);
+CREATE INDEX IF NOT EXISTS idx_episodic_strategy
+ON episodic_memory(strategy);
+CREATE INDEX IF NOT EXISTS idx_episodic_timestamp
+ON episodic_memory(timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_episodic_pnl_r
+ON episodic_memory(pnl_r);
+
+-- Semantic Memory (Section 2.2 — confidence/uncertainty computed in Python)
+CREATE TABLE IF NOT EXISTS semantic_memory (
+    id TEXT PRIMARY KEY,
+    proposition TEXT NOT NULL,
+    alpha REAL NOT NULL DEFAULT 1.0,
+    beta REAL NOT NULL DEFAULT 1.0,
+    sample_size INTEGER NOT NULL DEFAULT 0,
+    strategy TEXT,
+    symbol TEXT,
+    regime TEXT,
+    volatility_regime TEXT,
+    validity_conditions TEXT,
+    last_confirmed TEXT,
+    last_contradicted TEXT,
+    source TEXT NOT NULL,
+    retrieval_strength REAL DEFAULT 1.0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+-- Procedural Memory (Section 2.3)
+CREATE TABLE IF NOT EXISTS procedural_memory (
+    id TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    behavior_type TEXT NOT NULL,
+    sample_size INTEGER NOT NULL DEFAULT 0,
+    avg_hold_winners REAL,
+    avg_hold_losers REAL,
+    disposition_ratio REAL,
+    actual_lot_mean REAL,
+    actual_lot_variance REAL,
+    kelly_fraction_suggested REAL,
+    lot_vs_kelly_ratio REAL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+-- Affective State (Section 2.4 — single row, no GENERATED ALWAYS)
+CREATE TABLE IF NOT EXISTS affective_state (
+    id TEXT PRIMARY KEY,
+    confidence_level REAL NOT NULL DEFAULT 0.5,
+    risk_appetite REAL NOT NULL DEFAULT 1.0,
+    momentum_bias REAL NOT NULL DEFAULT 0.0,
+    peak_equity REAL NOT NULL,
+    current_equity REAL NOT NULL,
+    drawdown_state REAL NOT NULL DEFAULT 0.0,
+    max_acceptable_drawdown REAL NOT NULL DEFAULT 0.20,
+    consecutive_wins INTEGER NOT NULL DEFAULT 0,
+    consecutive_losses INTEGER NOT NULL DEFAULT 0,
+    last_updated TEXT NOT NULL,
+    history_json TEXT DEFAULT '[]'
+);
+
+-- Prospective Memory (Section 2.5)
+CREATE TABLE IF NOT EXISTS prospective_memory (
+    id TEXT PRIMARY KEY,
+    trigger_type TEXT NOT NULL,
+    trigger_condition TEXT NOT NULL,
+    planned_action TEXT NOT NULL,
+    action_type TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    priority REAL NOT NULL DEFAULT 0.5,
+    expiry TEXT,
+    source_episodic_ids TEXT,
+    source_semantic_ids TEXT,
+    reasoning TEXT NOT NULL,
+    triggered_at TEXT,
+    outcome_pnl_r REAL,
+    outcome_reflection TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_prospective_status
+ON prospective_memory(status);
+CREATE INDEX IF NOT EXISTS idx_prospective_trigger
+ON prospective_memory(trigger_type);
+
+-- Changepoint detection state (Bayesian BOCPD)
+CREATE TABLE IF NOT EXISTS changepoint_state (
+    id TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    state_json TEXT NOT NULL,
+    last_observation_count INTEGER DEFAULT 0,
+    last_changepoint_prob REAL DEFAULT 0.0,
+    last_changepoint_at INTEGER,
+    updated_at TEXT NOT NULL
+);
+
+-- Recall event logging (for MCP recall analytics)
+CREATE TABLE IF NOT EXISTS recall_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    query_symbol TEXT,
+    query_context TEXT,
+    query_regime TEXT,
+    num_candidates INTEGER DEFAULT 0,
+    num_returned INTEGER DEFAULT 0,
+    avg_score REAL DEFAULT 0.0
+);
+"""
+
+_TRADE_INSERT_SQL = """
+    INSERT OR IGNORE INTO trade_records VALUES (
+        :id, :timestamp, :symbol, :direction, :lot_size, :strategy,
+        :confidence, :reasoning, :market_context, :trade_references,
+        :exit_timestamp, :exit_price, :pnl, :pnl_r, :hold_duration,
+        :exit_reasoning, :slippage, :execution_quality, :lessons,
+        :tags, :grade
+    )
+"""
+
+_PATTERN_INSERT_SQL = """
+    INSERT OR REPLACE INTO patterns VALUES (
+        :pattern_id, :pattern_type, :description, :confidence,
+        :sample_size, :date_range, :strategy, :symbol,
+        :metrics, :source, :validation_status, :discovered_at
+    )
+"""
+
+_ADJUSTMENT_INSERT_SQL = """
+    INSERT OR REPLACE INTO strategy_adjustments VALUES (
+        :adjustment_id, :adjustment_type, :parameter,
+        :old_value, :new_value, :reason,
+        :source_pattern_id, :confidence, :status,
+        :created_at, :applied_at
+    )
+"""
+
+# Upsert rather than INSERT OR REPLACE: an existing agent's row is updated
+# in place instead of deleted and reinserted
+_SESSION_STATE_UPSERT_SQL = """
+    INSERT INTO session_state VALUES (
+        :agent_id, :last_active, :warm_memory,
+        :active_positions, :risk_constraints
+    )
+    ON CONFLICT(agent_id) DO UPDATE SET
+        last_active = excluded.last_active,
+        warm_memory = excluded.warm_memory,
+        active_positions = excluded.active_positions,
+        risk_constraints = excluded.risk_constraints
+"""
+
+# IDs per IN (...) lookup; SQLite's default parameter limit is 999 before 3.32
+_ID_LOOKUP_BATCH = 500
+
+_OUTCOME_FIELDS = (
+    'exit_timestamp', 'exit_price', 'pnl', 'pnl_r', 'hold_duration',
+    'exit_reasoning', 'slippage', 'execution_quality', 'lessons', 'grade',
+)
+
+# One fixed statement for every partial outcome update, so it stays in the
+# sqlite3 statement cache. :set_<col> is 1 only for keys the caller passed,
+# which keeps an explicit None distinct from "leave unchanged".
+_OUTCOME_UPDATE_SQL = (
+    "UPDATE trade_records SET "
+    + ", ".join(
+        f"{col} = CASE WHEN :set_{col} THEN :{col} ELSE {col} END"
+        for col in _OUTCOME_FIELDS
+    )
+    + " WHERE id = :id"
+)
+
+# {where} is a _trade_filter() tail, so the window matches query_trades.
+# Best/worst ties go to the newest trade.
+_STRATEGY_PNL_SUMMARY_SQL = """
+    WITH recent AS (
+        SELECT id, strategy, pnl, timestamp FROM trade_records{where}
+    ), closed AS (
+        SELECT id, strategy, pnl, timestamp,
+               ROW_NUMBER() OVER (
+                   PARTITION BY strategy ORDER BY pnl DESC, timestamp DESC
+               ) AS best_rank,
+               ROW_NUMBER() OVER (
+                   PARTITION BY strategy ORDER BY pnl ASC, timestamp DESC
+               ) AS worst_rank
+        FROM recent WHERE pnl IS NOT NULL
+    )
+    SELECT strategy,
+           COUNT(*) AS trade_count,
+           SUM(pnl > 0) AS win_count,
+           SUM(pnl <= 0) AS loss_count,
+           SUM(pnl) AS total_pnl,
+           TOTAL(CASE WHEN pnl > 0 THEN pnl END) AS sum_wins,
+           TOTAL(CASE WHEN pnl <= 0 THEN pnl END) AS sum_losses,
+           MAX(CASE WHEN best_rank = 1 THEN id END) AS best_id,
+           MAX(pnl) AS best_pnl,
+           MAX(CASE WHEN worst_rank = 1 THEN id END) AS worst_id,
+           MIN(pnl) AS worst_pnl
+    FROM closed
+    GROUP BY strategy
+    ORDER BY MAX(timestamp) DESC
+"""
+
+_PROSPECTIVE_STATUS_UPDATE_SQL = """
+    UPDATE prospective_memory SET
+        status = ?,
+        triggered_at = COALESCE(?, triggered_at),
+        outcome_pnl_r = COALESCE(?, outcome_pnl_r),
+        outcome_reflection = COALESCE(?, outcome_reflection)
+    WHERE id = ?
+"""
+
+# trade_records columns with trade_references aliased to the model field
+# name (last, where the old rename put it), so rows need no key rewrite
+_TRADE_SELECT = """
+    SELECT id, timestamp, symbol, direction, lot_size, strategy, confidence,
+           reasoning, market_context, exit_timestamp, exit_price, pnl, pnl_r,
+           hold_duration, exit_reasoning, slippage, execution_quality, lessons,
+           tags, grade, trade_references AS "references"
+    FROM trade_records
+"""
+
+
+def _tuple_cursor(
+    conn: sqlite3.Connection, sql: str, params: Sequence[Any]
+) -> sqlite3.Cursor:
+    """Execute on a cursor that yields plain tuples instead of sqlite3.Row.
+
+    Hot read paths build their own dicts, so the Row wrapper per row is
+    pure overhead; column names come from cursor.description once.
+    """
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur.execute(sql, params)
+
+
+# Column name -> select expression for query_trades_projected
+_TRADE_PROJECTIONS = {
+    col: col for col in (
+        'id', 'timestamp', 'symbol', 'direction', 'lot_size', 'strategy',
+        'confidence', 'reasoning', 'market_context', 'exit_timestamp',
+        'exit_price', 'pnl', 'pnl_r', 'hold_duration', 'exit_reasoning',
+        'slippage', 'execution_quality', 'lessons', 'tags', 'grade',
+    )
+}
+_TRADE_PROJECTIONS['references'] = 'trade_references AS "references"'
+_TRADE_JSON_COLUMNS = frozenset(('market_context', 'references', 'tags'))
+
+
+def _build_trade_filter_tail(
+    by_strategy: bool, by_symbol: bool, only_open: bool
+) -> str:
+    conditions = [
+        cond for cond, on in (
+            ("strategy = ?", by_strategy),
+            ("symbol = ?", by_symbol),
+            ("exit_timestamp IS NULL", only_open),
+        ) if on
+    ]
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where + " ORDER BY timestamp DESC LIMIT ?"
+
+
+# One canonical SQL tail per filter combination, so each query shape has
+# exactly one statement text in the sqlite3 statement cache
+_TRADE_FILTER_TAILS = {
+    key: _build_trade_filter_tail(*key)
+    for key in itertools.product((False, True), repeat=3)
+}
+
+
+def _trade_filter(
+    strategy: Optional[str], symbol: Optional[str], limit: int,
+    only_open: bool = False,
+) -> tuple[str, List[Any]]:
+    """WHERE/ORDER/LIMIT tail and params shared by the trade history queries."""
+    params: List[Any] = [p for p in (strategy, symbol) if p]
+    params.append(limit)
+    return _TRADE_FILTER_TAILS[(bool(strategy), bool(symbol), only_open)], params
+
+
+def _column_names(cur: sqlite3.Cursor) -> List[str]:
+    return [d[0] for d in cur.description]
+
+
+def _trade_from_row(columns: List[str], row: tuple) -> Dict[str, Any]:
+    """Decode a _TRADE_SELECT row into the trade dict shape callers expect."""
+    trade = dict(zip(columns, row))
+    trade['market_context'] = _json_loads(trade['market_context'])
+    trade['references'] = _json_loads(trade['references'])
+    trade['tags'] = _json_loads(trade['tags'])
+    return trade
+
 
 class Database:
-    """SQLite database manager"""
+    """
+    SQLite database manager.
+
+    The file runs in WAL mode, so SQLite keeps ``<db>-wal`` and ``<db>-shm``
+    sidecar files next to it while connections are open. Copy all three (or
+    close every connection first) when moving a live database.
+    """
 
     def __init__(self, db_path: str | None = None):
         """
@@ -39,298 +491,78 @@ class Database:
                     db_path = "data/tradememory.db"
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One long-lived connection per thread (sqlite3 connections are
+        # thread-bound), opened lazily by get_connection()
+        self._local = threading.local()
         self._init_schema()
 
+    def __enter__(self) -> "Database":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the calling thread's cached connection; reopened on next use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.execute("PRAGMA optimize")
+            conn.close()
+
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection"""
-        conn = sqlite3.connect(self.db_path)
+        """Open a new, caller-owned database connection"""
+        conn = sqlite3.connect(self.db_path, cached_statements=256)
         conn.row_factory = sqlite3.Row  # Return rows as dicts
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
         return conn
 
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections with auto-commit/rollback."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """
+        Context manager for database connections with auto-commit/rollback.
+
+        Reuses this thread's long-lived connection. Nested blocks join the
+        outermost one, which alone commits or rolls back.
+        """
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = self._get_connection()
+            local.depth = 0
+        outermost = local.depth == 0
+        local.depth += 1
         try:
             yield conn
-            conn.commit()
+            if outermost:
+                conn.commit()
         except Exception:
-            conn.rollback()
+            if outermost:
+                conn.rollback()
             raise
         finally:
-            conn.close()
+            local.depth -= 1
 
     def _init_schema(self):
         """Initialize database schema"""
         conn = self._get_connection()
         try:
-            # Trade records table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS trade_records (
-                    id TEXT PRIMARY KEY,
-                    timestamp TEXT NOT NULL,
-                    symbol TEXT NOT NULL,
-                    direction TEXT NOT NULL,
-                    lot_size REAL NOT NULL,
-                    strategy TEXT NOT NULL,
-                    confidence REAL NOT NULL,
-                    reasoning TEXT NOT NULL,
-                    market_context TEXT NOT NULL,
-                    trade_references TEXT NOT NULL,
-                    exit_timestamp TEXT,
-                    exit_price REAL,
-                    pnl REAL,
-                    pnl_r REAL,
-                    hold_duration INTEGER,
-                    exit_reasoning TEXT,
-                    slippage REAL,
-                    execution_quality REAL,
-                    lessons TEXT,
-                    tags TEXT,
-                    grade TEXT
-                )
-            """)
-
-            # Session state table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS session_state (
-                    agent_id TEXT PRIMARY KEY,
-                    last_active TEXT NOT NULL,
-                    warm_memory TEXT NOT NULL,
-                    active_positions TEXT NOT NULL,
-                    risk_constraints TEXT NOT NULL
-                )
-            """)
-
-            # Indexes for common queries
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_timestamp
-                ON trade_records(timestamp DESC)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_strategy
-                ON trade_records(strategy)
-            """)
-
-            # Patterns table (L2 layer)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS patterns (
-                    pattern_id TEXT PRIMARY KEY,
-                    pattern_type TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    confidence REAL NOT NULL,
-                    sample_size INTEGER NOT NULL,
-                    date_range TEXT NOT NULL,
-                    strategy TEXT,
-                    symbol TEXT,
-                    metrics TEXT NOT NULL,
-                    source TEXT NOT NULL DEFAULT 'backtest_auto',
-                    validation_status TEXT NOT NULL DEFAULT 'IN_SAMPLE',
-                    discovered_at TEXT NOT NULL
-                )
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_patterns_strategy_symbol
-                ON patterns(strategy, symbol)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_patterns_type
-                ON patterns(pattern_type)
-            """)
-
-            # Strategy adjustments table (L3 layer)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS strategy_adjustments (
-                    adjustment_id TEXT PRIMARY KEY,
-                    adjustment_type TEXT NOT NULL,
-                    parameter TEXT NOT NULL,
-                    old_value TEXT NOT NULL,
-                    new_value TEXT NOT NULL,
-                    reason TEXT NOT NULL,
-                    source_pattern_id TEXT,
-                    confidence REAL NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'proposed',
-                    created_at TEXT NOT NULL,
-                    applied_at TEXT,
-                    FOREIGN KEY (source_pattern_id) REFERENCES patterns(pattern_id)
-                )
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_adjustments_status
-                ON strategy_adjustments(status)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_adjustments_type
-                ON strategy_adjustments(adjustment_type)
-            """)
-
-            # ========== OWM Tables ==========
-
-            # Episodic Memory (Section 2.1)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS episodic_memory (
-                    id TEXT PRIMARY KEY,
-                    timestamp TEXT NOT NULL,
-                    context_json TEXT NOT NULL,
-                    context_regime TEXT,
-                    context_volatility_regime TEXT,
-                    context_session TEXT,
-                    context_atr_d1 REAL,
-                    context_atr_h1 REAL,
-                    strategy TEXT NOT NULL,
-                    direction TEXT NOT NULL,
-                    entry_price REAL NOT NULL,
-                    lot_size REAL,
-                    exit_price REAL,
-                    pnl REAL,
-                    pnl_r REAL,
-                    hold_duration_seconds INTEGER,
-                    max_adverse_excursion REAL,
-                    reflection TEXT,
-                    confidence REAL DEFAULT 0.5,
-                    tags TEXT,
-                    retrieval_strength REAL DEFAULT 1.0,
-                    retrieval_count INTEGER DEFAULT 0,
-                    last_retrieved TEXT,
-                    created_at TEXT NOT NULL
-                )
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_episodic_regime
-                ON episodic_memory(context_regime)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_episodic_strategy
-                ON episodic_memory(strategy)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_episodic_timestamp
-                ON episodic_memory(timestamp DESC)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_episodic_pnl_r
-                ON episodic_memory(pnl_r)
-            """)
-
-            # Semantic Memory (Section 2.2 — confidence/uncertainty computed in Python)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS semantic_memory (
-                    id TEXT PRIMARY KEY,
-                    proposition TEXT NOT NULL,
-                    alpha REAL NOT NULL DEFAULT 1.0,
-                    beta REAL NOT NULL DEFAULT 1.0,
-                    sample_size INTEGER NOT NULL DEFAULT 0,
-                    strategy TEXT,
-                    symbol TEXT,
-                    regime TEXT,
-                    volatility_regime TEXT,
-                    validity_conditions TEXT,
-                    last_confirmed TEXT,
-                    last_contradicted TEXT,
-                    source TEXT NOT NULL,
-                    retrieval_strength REAL DEFAULT 1.0,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
-
-            # Procedural Memory (Section 2.3)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS procedural_memory (
-                    id TEXT PRIMARY KEY,
-                    strategy TEXT NOT NULL,
-                    symbol TEXT NOT NULL,
-                    behavior_type TEXT NOT NULL,
-                    sample_size INTEGER NOT NULL DEFAULT 0,
-                    avg_hold_winners REAL,
-                    avg_hold_losers REAL,
-                    disposition_ratio REAL,
-                    actual_lot_mean REAL,
-                    actual_lot_variance REAL,
-                    kelly_fraction_suggested REAL,
-                    lot_vs_kelly_ratio REAL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
-
-            # Affective State (Section 2.4 — single row, no GENERATED ALWAYS)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS affective_state (
-                    id TEXT PRIMARY KEY,
-                    confidence_level REAL NOT NULL DEFAULT 0.5,
-                    risk_appetite REAL NOT NULL DEFAULT 1.0,
-                    momentum_bias REAL NOT NULL DEFAULT 0.0,
-                    peak_equity REAL NOT NULL,
-                    current_equity REAL NOT NULL,
-                    drawdown_state REAL NOT NULL DEFAULT 0.0,
-                    max_acceptable_drawdown REAL NOT NULL DEFAULT 0.20,
-                    consecutive_wins INTEGER NOT NULL DEFAULT 0,
-                    consecutive_losses INTEGER NOT NULL DEFAULT 0,
-                    last_updated TEXT NOT NULL,
-                    history_json TEXT DEFAULT '[]'
-                )
-            """)
-
-            # Prospective Memory (Section 2.5)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS prospective_memory (
-                    id TEXT PRIMARY KEY,
-                    trigger_type TEXT NOT NULL,
-                    trigger_condition TEXT NOT NULL,
-                    planned_action TEXT NOT NULL,
-                    action_type TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'active',
-                    priority REAL NOT NULL DEFAULT 0.5,
-                    expiry TEXT,
-                    source_episodic_ids TEXT,
-                    source_semantic_ids TEXT,
-                    reasoning TEXT NOT NULL,
-                    triggered_at TEXT,
-                    outcome_pnl_r REAL,
-                    outcome_reflection TEXT,
-                    created_at TEXT NOT NULL
-                )
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_prospective_status
-                ON prospective_memory(status)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_prospective_trigger
-                ON prospective_memory(trigger_type)
-            """)
-
-            # Changepoint detection state (Bayesian BOCPD)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS changepoint_state (
-                    id TEXT PRIMARY KEY,
-                    strategy TEXT NOT NULL,
-                    symbol TEXT NOT NULL,
-                    state_json TEXT NOT NULL,
-                    last_observation_count INTEGER DEFAULT 0,
-                    last_changepoint_prob REAL DEFAULT 0.0,
-                    last_changepoint_at INTEGER,
-                    updated_at TEXT NOT NULL
-                )
-            """)
-
-            # Recall event logging (for MCP recall analytics)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS recall_events (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    query_symbol TEXT,
-                    query_context TEXT,
-                    query_regime TEXT,
-                    num_candidates INTEGER DEFAULT 0,
-                    num_returned INTEGER DEFAULT 0,
-                    avg_score REAL DEFAULT 0.0
-                )
-            """)
+            # WAL: readers don't block the writer, one fsync per commit
+            conn.execute("PRAGMA journal_mode=WAL")
+
+            # One parse and one transaction for the whole schema
+            conn.executescript(f"BEGIN;\n{_SCHEMA_SQL}COMMIT;")
 
-            conn.commit()
+            # Give the planner statistics once; close() keeps them fresh
+            # via PRAGMA optimize. analysis_limit bounds the cost on big files.
+            has_stats = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+            if not has_stats:
+                conn.execute("PRAGMA analysis_limit=400")
+                conn.execute("ANALYZE")
+                conn.commit()
         finally:
             conn.close()
 
@@ -346,30 +578,46 @@ class Database:
         """
         try:
             with self.get_connection() as conn:
-                # Convert datetime objects to ISO strings
-                if isinstance(trade_data.get('timestamp'), datetime):
-                    trade_data['timestamp'] = trade_data['timestamp'].isoformat()
-                if isinstance(trade_data.get('exit_timestamp'), datetime):
-                    trade_data['exit_timestamp'] = trade_data['exit_timestamp'].isoformat()
-
-                # Serialize JSON fields
-                trade_data['market_context'] = json.dumps(trade_data.get('market_context', {}))
-                trade_data['trade_references'] = json.dumps(trade_data.get('references', []))
-                trade_data['tags'] = json.dumps(trade_data.get('tags', []))
+                # Serialize JSON fields (datetimes bind via the module adapter)
+                trade_data['market_context'] = _json_dumps(trade_data.get('market_context', {}))
+                trade_data['trade_references'] = _json_dumps(trade_data.get('references', []))
+                trade_data['tags'] = _json_dumps(trade_data.get('tags', []))
 
-                conn.execute("""
-                    INSERT OR IGNORE INTO trade_records VALUES (
-                        :id, :timestamp, :symbol, :direction, :lot_size, :strategy,
-                        :confidence, :reasoning, :market_context, :trade_references,
-                        :exit_timestamp, :exit_price, :pnl, :pnl_r, :hold_duration,
-                        :exit_reasoning, :slippage, :execution_quality, :lessons,
-                        :tags, :grade
-                    )
-                """, trade_data)
+                conn.execute(_TRADE_INSERT_SQL, trade_data)
                 return True
         except sqlite3.Error as e:
             raise TradeMemoryDBError(f"Failed to insert trade: {e}") from e
 
+    def insert_trades_bulk(self, trades: List[Dict[str, Any]]) -> int:
+        """
+        Insert many trade records in one transaction.
+
+        Same row format as insert_trade(); existing ids are ignored.
+        Input dicts are not modified.
+
+        Args:
+            trades: Trade record dictionaries
+
+        Returns:
+            Number of rows actually inserted
+        """
+        dumps = _json_dumps
+        rows = []
+        for trade in trades:
+            row = dict(trade)
+            row['market_context'] = dumps(row.get('market_context', {}))
+            row['trade_references'] = dumps(row.get('references', []))
+            row['tags'] = dumps(row.get('tags', []))
+            rows.append(row)
+
+        try:
+            with self.get_connection() as conn:
+                before = conn.total_changes
+                conn.executemany(_TRADE_INSERT_SQL, rows)
+                return conn.total_changes - before
+        except sqlite3.Error as e:
+            raise TradeMemoryDBError(f"Failed to bulk insert trades: {e}") from e
+
     def update_trade_outcome(self, trade_id: str, outcome_data: Dict[str, Any]) -> bool:
         """
         Update trade with exit outcome.
@@ -381,27 +629,18 @@ class Database:
         Returns:
             True if successful
         """
-        # Convert datetime if present
-        if isinstance(outcome_data.get('exit_timestamp'), datetime):
-            outcome_data['exit_timestamp'] = outcome_data['exit_timestamp'].isoformat()
-
-        # Build UPDATE query
-        fields = []
-        for key in ['exit_timestamp', 'exit_price', 'pnl', 'pnl_r',
-                    'hold_duration', 'exit_reasoning', 'slippage',
-                    'execution_quality', 'lessons', 'grade']:
-            if key in outcome_data:
-                fields.append(f"{key} = :{key}")
-
-        if not fields:
+        if not any(key in outcome_data for key in _OUTCOME_FIELDS):
             return False
 
+        params = {'id': trade_id}
+        for key in _OUTCOME_FIELDS:
+            present = key in outcome_data
+            params[f'set_{key}'] = present
+            params[key] = outcome_data[key] if present else None
+
         try:
             with self.get_connection() as conn:
-                query = f"UPDATE trade_records SET {', '.join(fields)} WHERE id = :id"  # nosec B608 — fields from internal whitelist
-                outcome_data['id'] = trade_id
-
-                conn.execute(query, outcome_data)
+                conn.execute(_OUTCOME_UPDATE_SQL, params)
                 return True
         except sqlite3.Error as e:
             raise TradeMemoryDBError(f"Failed to update trade outcome: {e}") from e
@@ -417,28 +656,68 @@ class Database:
             Trade record dict or None
         """
         with self.get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM trade_records WHERE id = ?",
-                (trade_id,)
-            ).fetchone()
+            cur = _tuple_cursor(conn, _TRADE_SELECT + " WHERE id = ?", (trade_id,))
+            row = cur.fetchone()
 
             if not row:
                 return None
 
-            # Convert to dict and deserialize JSON fields
-            trade = dict(row)
-            trade['market_context'] = json.loads(trade['market_context'])
-            trade['references'] = json.loads(trade['trade_references'])
-            del trade['trade_references']  # Remove DB column name
-            trade['tags'] = json.loads(trade['tags'])
+            return _trade_from_row(_column_names(cur), row)
 
-            return trade
+    def query_trade_ids(self, prefix: str) -> Set[str]:
+        """
+        IDs of all trades whose ID starts with prefix.
+
+        Runs as a range scan on the primary key ([prefix, next prefix)),
+        which LIKE 'prefix%' would not use.
+
+        Args:
+            prefix: Non-empty ID prefix, e.g. "MT5-"
+
+        Returns:
+            Set of matching trade IDs
+        """
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        with self.get_connection() as conn:
+            cur = _tuple_cursor(
+                conn,
+                "SELECT id FROM trade_records WHERE id >= ? AND id < ?",
+                (prefix, upper),
+            )
+            return {row[0] for row in cur}
+
+    def query_known_trade_ids(self, ids: Sequence[str]) -> Set[str]:
+        """
+        The subset of ids already stored in trade_records.
+
+        Looked up in primary-key batches of _ID_LOOKUP_BATCH, below
+        SQLite's bound-parameter limit.
+
+        Args:
+            ids: Candidate trade IDs
+
+        Returns:
+            Set of the IDs that exist
+        """
+        known: Set[str] = set()
+        with self.get_connection() as conn:
+            for start in range(0, len(ids), _ID_LOOKUP_BATCH):
+                batch = ids[start:start + _ID_LOOKUP_BATCH]
+                placeholders = ", ".join("?" * len(batch))
+                cur = _tuple_cursor(
+                    conn,
+                    f"SELECT id FROM trade_records WHERE id IN ({placeholders})",
+                    batch,
+                )
+                known.update(row[0] for row in cur)
+        return known
 
     def query_trades(
         self,
         strategy: Optional[str] = None,
         symbol: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        only_open: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Query trade records with filters.
@@ -447,36 +726,112 @@ class Database:
             strategy: Filter by strategy
             symbol: Filter by symbol
             limit: Maximum number of results
+            only_open: Only trades without an exit yet
 
         Returns:
             List of trade records
         """
+        where, params = _trade_filter(strategy, symbol, limit, only_open)
         with self.get_connection() as conn:
-            query = "SELECT * FROM trade_records WHERE 1=1"
-            params: list[Any] = []
+            # Decode straight off the cursor, no intermediate fetchall() list
+            cur = _tuple_cursor(conn, _TRADE_SELECT + where, params)
+            columns = _column_names(cur)
+            return [_trade_from_row(columns, row) for row in cur]
 
-            if strategy:
-                query += " AND strategy = ?"
-                params.append(strategy)
-            if symbol:
-                query += " AND symbol = ?"
-                params.append(symbol)
+    def query_trades_projected(
+        self,
+        columns: Sequence[str],
+        strategy: Optional[str] = None,
+        symbol: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Like query_trades(), but only the given columns.
 
-            query += " ORDER BY timestamp DESC LIMIT ?"
-            params.append(limit)
+        Columns that are not requested are neither read nor decoded, so
+        callers that need a few scalars skip the JSON and long text fields.
+        JSON columns that are requested come back decoded.
 
-            rows = conn.execute(query, params).fetchall()
+        Args:
+            columns: Trade dict keys to return (see query_trades)
+            strategy: Filter by strategy
+            symbol: Filter by symbol
+            limit: Maximum number of results
 
-            trades = []
+        Returns:
+            List of dicts with exactly those keys, newest first
+
+        Raises:
+            ValueError: If a column is not a trade record field
+        """
+        unknown = [c for c in columns if c not in _TRADE_PROJECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown trade columns: {unknown}")
+
+        select = ", ".join(_TRADE_PROJECTIONS[c] for c in columns)
+        json_cols = [c for c in columns if c in _TRADE_JSON_COLUMNS]
+        where, params = _trade_filter(strategy, symbol, limit)
+        with self.get_connection() as conn:
+            # Interpolated columns come from the _TRADE_PROJECTIONS whitelist
+            sql = f"SELECT {select} FROM trade_records" + where  # nosec B608
+            cur = _tuple_cursor(conn, sql, params)
+            rows = [dict(zip(columns, row)) for row in cur]
+
+        for col in json_cols:
             for row in rows:
-                trade = dict(row)
-                trade['market_context'] = json.loads(trade['market_context'])
-                trade['references'] = json.loads(trade['trade_references'])
-                del trade['trade_references']  # Remove DB column name
-                trade['tags'] = json.loads(trade['tags'])
-                trades.append(trade)
+                row[col] = _json_loads(row[col])
+        return rows
+
+    def query_trade_outcomes(
+        self,
+        strategy: Optional[str] = None,
+        symbol: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Like query_trades(), but only id, strategy and pnl.
+
+        For aggregate stats: skips reading and decoding the JSON columns.
+
+        Args:
+            strategy: Filter by strategy
+            symbol: Filter by symbol
+            limit: Maximum number of results
+
+        Returns:
+            List of {'id', 'strategy', 'pnl'} dicts, newest first
+        """
+        return self.query_trades_projected(
+            ('id', 'strategy', 'pnl'), strategy=strategy, symbol=symbol, limit=limit
+        )
+
+    def strategy_pnl_summary(
+        self,
+        strategy: Optional[str] = None,
+        symbol: Optional[str] = None,
+        limit: int = 10000
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-strategy P&L aggregates over closed trades, computed in SQL.
 
-            return trades
+        Covers the same rows as query_trades(strategy, symbol, limit) with
+        pnl set, so only one row per strategy comes back to Python.
+
+        Args:
+            strategy: Filter by strategy
+            symbol: Filter by symbol
+            limit: Newest trades to consider (open ones included)
+
+        Returns:
+            One dict per strategy, most recently traded first, with
+            trade_count, win_count, loss_count, total_pnl, sum_wins,
+            sum_losses, best_id, best_pnl, worst_id, worst_pnl
+        """
+        where, params = _trade_filter(strategy, symbol, limit)
+        with self.get_connection() as conn:
+            cur = _tuple_cursor(conn, _STRATEGY_PNL_SUMMARY_SQL.format(where=where), params)
+            columns = _column_names(cur)
+            return [dict(zip(columns, row)) for row in cur]
 
     def save_session_state(self, state_data: Dict[str, Any]) -> bool:
         """
@@ -490,20 +845,12 @@ class Database:
         """
         try:
             with self.get_connection() as conn:
-                if isinstance(state_data.get('last_active'), datetime):
-                    state_data['last_active'] = state_data['last_active'].isoformat()
-
                 # Serialize JSON fields
-                state_data['warm_memory'] = json.dumps(state_data.get('warm_memory', {}))
-                state_data['active_positions'] = json.dumps(state_data.get('active_positions', []))
-                state_data['risk_constraints'] = json.dumps(state_data.get('risk_constraints', {}))
+                state_data['warm_memory'] = _json_dumps(state_data.get('warm_memory', {}))
+                state_data['active_positions'] = _json_dumps(state_data.get('active_positions', []))
+                state_data['risk_constraints'] = _json_dumps(state_data.get('risk_constraints', {}))
 
-                conn.execute("""
-                    INSERT OR REPLACE INTO session_state VALUES (
-                        :agent_id, :last_active, :warm_memory,
-                        :active_positions, :risk_constraints
-                    )
-                """, state_data)
+                conn.execute(_SESSION_STATE_UPSERT_SQL, state_data)
                 return True
         except sqlite3.Error as e:
             raise TradeMemoryDBError(f"Failed to save session state: {e}") from e
@@ -519,18 +866,20 @@ class Database:
             Session state dict or None
         """
         with self.get_connection() as conn:
-            row = conn.execute(
+            cur = _tuple_cursor(
+                conn,
                 "SELECT * FROM session_state WHERE agent_id = ?",
                 (agent_id,)
-            ).fetchone()
+            )
+            row = cur.fetchone()
 
             if not row:
                 return None
 
-            state = dict(row)
-            state['warm_memory'] = json.loads(state['warm_memory'])
-            state['active_positions'] = json.loads(state['active_positions'])
-            state['risk_constraints'] = json.loads(state['risk_constraints'])
+            state = dict(zip(_column_names(cur), row))
+            state['warm_memory'] = _json_loads(state['warm_memory'])
+            state['active_positions'] = _json_loads(state['active_positions'])
+            state['risk_constraints'] = _json_loads(state['risk_constraints'])
 
             return state
 
@@ -548,18 +897,33 @@ class Database:
         """
         try:
             with self.get_connection() as conn:
-                pattern_data['metrics'] = json.dumps(pattern_data.get('metrics', {}))
-                conn.execute("""
-                    INSERT OR REPLACE INTO patterns VALUES (
-                        :pattern_id, :pattern_type, :description, :confidence,
-                        :sample_size, :date_range, :strategy, :symbol,
-                        :metrics, :source, :validation_status, :discovered_at
-                    )
-                """, pattern_data)
+                pattern_data['metrics'] = _json_dumps(pattern_data.get('metrics', {}))
+                conn.execute(_PATTERN_INSERT_SQL, pattern_data)
                 return True
         except sqlite3.Error as e:
             raise TradeMemoryDBError(f"Failed to insert pattern: {e}") from e
 
+    def insert_patterns_bulk(self, patterns: List[Dict[str, Any]]) -> int:
+        """
+        Insert or replace many pattern records in one transaction.
+
+        Same row format as insert_pattern(); input dicts are not modified.
+
+        Args:
+            patterns: Pattern dictionaries
+
+        Returns:
+            Number of patterns written
+        """
+        dumps = _json_dumps
+        rows = [{**p, 'metrics': dumps(p.get('metrics', {}))} for p in patterns]
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(_PATTERN_INSERT_SQL, rows)
+                return len(rows)
+        except sqlite3.Error as e:
+            raise TradeMemoryDBError(f"Failed to bulk insert patterns: {e}") from e
+
     def query_patterns(
         self,
         strategy: Optional[str] = None,
@@ -606,7 +970,7 @@ class Database:
             patterns = []
             for row in rows:
                 p = dict(row)
-                p['metrics'] = json.loads(p['metrics'])
+                p['metrics'] = _json_loads(p['metrics'])
                 patterns.append(p)
 
             return patterns
@@ -631,7 +995,7 @@ class Database:
                 return None
 
             p = dict(row)
-            p['metrics'] = json.loads(p['metrics'])
+            p['metrics'] = _json_loads(p['metrics'])
             return p
 
     # ========== Strategy Adjustments (L3) ==========
@@ -648,18 +1012,28 @@ class Database:
         """
         try:
             with self.get_connection() as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO strategy_adjustments VALUES (
-                        :adjustment_id, :adjustment_type, :parameter,
-                        :old_value, :new_value, :reason,
-                        :source_pattern_id, :confidence, :status,
-                        :created_at, :applied_at
-                    )
-                """, adjustment_data)
+                conn.execute(_ADJUSTMENT_INSERT_SQL, adjustment_data)
                 return True
         except sqlite3.Error as e:
             raise TradeMemoryDBError(f"Failed to insert adjustment: {e}") from e
 
+    def insert_adjustments_bulk(self, adjustments: List[Dict[str, Any]]) -> int:
+        """
+        Insert or replace many strategy adjustments in one transaction.
+
+        Args:
+            adjustments: Adjustment dictionaries, as for insert_adjustment()
+
+        Returns:
+            Number of adjustments written
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(_ADJUSTMENT_INSERT_SQL, adjustments)
+                return len(adjustments)
+        except sqlite3.Error as e:
+            raise TradeMemoryDBError(f"Failed to bulk insert adjustments: {e}") from e
+
     def query_adjustments(
         self,
         status: Optional[str] = None,
@@ -736,9 +1110,9 @@ class Database:
         try:
             with self.get_connection() as conn:
                 if isinstance(data.get('tags'), (list, dict)):
-                    data['tags'] = json.dumps(data['tags'])
+                    data['tags'] = _json_dumps(data['tags'])
                 if isinstance(data.get('context_json'), dict):
-                    data['context_json'] = json.dumps(data['context_json'])
+                    data['context_json'] = _json_dumps(data['context_json'])
                 if 'created_at' not in data:
                     data['created_at'] = datetime.now(timezone.utc).isoformat()
                 conn.execute("""
@@ -792,8 +1166,8 @@ class Database:
             results = []
             for row in rows:
                 d = dict(row)
-                d['context_json'] = json.loads(d['context_json']) if d['context_json'] else {}
-                d['tags'] = json.loads(d['tags']) if d['tags'] else []
+                d['context_json'] = _json_loads(d['context_json']) if d['context_json'] else {}
+                d['tags'] = _json_loads(d['tags']) if d['tags'] else []
                 results.append(d)
             return results
 
@@ -826,7 +1200,7 @@ class Database:
                 except Exception:
                     pass  # Column already exists
 
-                embedding_json = json.dumps(embedding)
+                embedding_json = _json_dumps(embedding)
                 result = conn.execute(
                     "UPDATE episodic_memory SET embedding = ? WHERE id = ?",
                     (embedding_json, memory_id),
@@ -842,7 +1216,7 @@ class Database:
         try:
             with self.get_connection() as conn:
                 if isinstance(data.get('validity_conditions'), (dict, list)):
-                    data['validity_conditions'] = json.dumps(data['validity_conditions'])
+                    data['validity_conditions'] = _json_dumps(data['validity_conditions'])
                 now = datetime.now(timezone.utc).isoformat()
                 data.setdefault('alpha', 1.0)
                 data.setdefault('beta', 1.0)
@@ -893,7 +1267,7 @@ class Database:
             results = []
             for row in rows:
                 d = dict(row)
-                d['validity_conditions'] = json.loads(d['validity_conditions']) if d['validity_conditions'] else None
+                d['validity_conditions'] = _json_loads(d['validity_conditions']) if d['validity_conditions'] else None
                 a, b = d['alpha'], d['beta']
                 d['confidence'] = a / (a + b) if (a + b) > 0 else 0.5
                 d['uncertainty'] = (a * b) / ((a + b) ** 2 * (a + b + 1)) if (a + b) > 0 else 1.0
@@ -944,7 +1318,7 @@ class Database:
         try:
             with self.get_connection() as conn:
                 now = datetime.now(timezone.utc).isoformat()
-                vc_json = json.dumps(validity_conditions)
+                vc_json = _json_dumps(validity_conditions)
                 result = conn.execute(
                     "UPDATE semantic_memory SET validity_conditions = ?, "
                     "updated_at = ? WHERE id = ?",
@@ -1040,7 +1414,7 @@ class Database:
             if not row:
                 return None
             d = dict(row)
-            d['history_json'] = json.loads(d['history_json']) if d['history_json'] else []
+            d['history_json'] = _json_loads(d['history_json']) if d['history_json'] else []
             return d
 
     def save_affective(self, data: Dict[str, Any]) -> bool:
@@ -1048,7 +1422,7 @@ class Database:
         try:
             with self.get_connection() as conn:
                 if isinstance(data.get('history_json'), (list, dict)):
-                    data['history_json'] = json.dumps(data['history_json'])
+                    data['history_json'] = _json_dumps(data['history_json'])
                 data['id'] = 'current'
                 data.setdefault('last_updated', datetime.now(timezone.utc).isoformat())
                 conn.execute("""
@@ -1118,13 +1492,13 @@ class Database:
         try:
             with self.get_connection() as conn:
                 if isinstance(data.get('trigger_condition'), (dict, list)):
-                    data['trigger_condition'] = json.dumps(data['trigger_condition'])
+                    data['trigger_condition'] = _json_dumps(data['trigger_condition'])
                 if isinstance(data.get('planned_action'), (dict, list)):
-                    data['planned_action'] = json.dumps(data['planned_action'])
+                    data['planned_action'] = _json_dumps(data['planned_action'])
                 if isinstance(data.get('source_episodic_ids'), (list,)):
-                    data['source_episodic_ids'] = json.dumps(data['source_episodic_ids'])
+                    data['source_episodic_ids'] = _json_dumps(data['source_episodic_ids'])
                 if isinstance(data.get('source_semantic_ids'), (list,)):
-                    data['source_semantic_ids'] = json.dumps(data['source_semantic_ids'])
+                    data['source_semantic_ids'] = _json_dumps(data['source_semantic_ids'])
                 data.setdefault('status', 'active')
                 data.setdefault('priority', 0.5)
                 data.setdefault('created_at', datetime.now(timezone.utc).isoformat())
@@ -1169,10 +1543,10 @@ class Database:
             results = []
             for row in rows:
                 d = dict(row)
-                d['trigger_condition'] = json.loads(d['trigger_condition']) if d['trigger_condition'] else {}
-                d['planned_action'] = json.loads(d['planned_action']) if d['planned_action'] else {}
-                d['source_episodic_ids'] = json.loads(d['source_episodic_ids']) if d['source_episodic_ids'] else []
-                d['source_semantic_ids'] = json.loads(d['source_semantic_ids']) if d['source_semantic_ids'] else []
+                d['trigger_condition'] = _json_loads(d['trigger_condition']) if d['trigger_condition'] else {}
+                d['planned_action'] = _json_loads(d['planned_action']) if d['planned_action'] else {}
+                d['source_episodic_ids'] = _json_loads(d['source_episodic_ids']) if d['source_episodic_ids'] else []
+                d['source_semantic_ids'] = _json_loads(d['source_semantic_ids']) if d['source_semantic_ids'] else []
                 results.append(d)
             return results
 
@@ -1187,21 +1561,12 @@ class Database:
         """Update prospective memory status and optional outcome fields."""
         try:
             with self.get_connection() as conn:
-                fields = ["status = ?"]
-                params: list[Any] = [status]
-                if triggered_at:
-                    fields.append("triggered_at = ?")
-                    params.append(triggered_at)
-                if outcome_pnl_r is not None:
-                    fields.append("outcome_pnl_r = ?")
-                    params.append(outcome_pnl_r)
-                if outcome_reflection is not None:
-                    fields.append("outcome_reflection = ?")
-                    params.append(outcome_reflection)
-                params.append(memory_id)
+                # None leaves a field unchanged (COALESCE), and one SQL text
+                # covers every combination, so the statement stays cached
                 result = conn.execute(
-                    f"UPDATE prospective_memory SET {', '.join(fields)} WHERE id = ?",  # nosec B608 — fields from internal whitelist
-                    params,
+                    _PROSPECTIVE_STATUS_UPDATE_SQL,
+                    (status, triggered_at or None, outcome_pnl_r,
+                     outcome_reflection, memory_id),
                 )
                 return result.rowcount > 0
         except sqlite3.Error as e:
@@ -4,10 +4,10 @@ Implements Blueprint Section 2.1 TradeJournal functionality.
 """
 
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 from .db import Database
-from .models import MarketContext, TradeDirection, TradeRecord
+from .models import TradeDirection, TradeRecord
 
 
 class TradeJournal:
@@ -58,6 +58,55 @@ class TradeJournal:
         Raises:
             ValueError: If validation fails
         """
+        trade, row = self._build_decision(
+            trade_id, symbol, direction, lot_size, strategy,
+            confidence, reasoning, market_context, references
+        )
+
+        # Persist to database
+        success = self.db.insert_trade(row)
+
+        if not success:
+            raise RuntimeError(f"Failed to insert trade {trade_id} to database")
+
+        return trade
+
+    def record_decisions(self, decisions: List[Dict[str, Any]]) -> List[TradeRecord]:
+        """
+        Record several trade decisions in one database transaction.
+
+        Args:
+            decisions: One dict per trade, with record_decision()'s keyword
+                arguments
+
+        Returns:
+            TradeRecord instances, in input order
+
+        Raises:
+            ValueError: If any decision fails validation (nothing is written)
+        """
+        built = [self._build_decision(**decision) for decision in decisions]
+        self.db.insert_trades_bulk([row for _, row in built])
+        return [trade for trade, _ in built]
+
+    @staticmethod
+    def _build_decision(
+        trade_id: str,
+        symbol: str,
+        direction: str,
+        lot_size: float,
+        strategy: str,
+        confidence: float,
+        reasoning: str,
+        market_context: Dict[str, Any],
+        references: Optional[List[str]] = None
+    ) -> Tuple[TradeRecord, Dict[str, Any]]:
+        """
+        Validate decision inputs; return the TradeRecord and its DB row.
+
+        The row is taken from the validated model's fields rather than a
+        full model_dump(); see _trade_row().
+        """
         # Validate inputs
         if not (0.0 <= confidence <= 1.0):
             raise ValueError(f"Confidence must be 0.0-1.0, got {confidence}")
@@ -65,7 +114,8 @@ class TradeJournal:
         if direction not in ['long', 'short']:
             raise ValueError(f"Direction must be 'long' or 'short', got {direction}")
 
-        # Create TradeRecord
+        # Create TradeRecord; market_context is validated from the dict in
+        # the same pass
         trade = TradeRecord(
             id=trade_id,
             timestamp=datetime.now(timezone.utc),
@@ -75,15 +125,35 @@ class TradeJournal:
             strategy=strategy,
             confidence=confidence,
             reasoning=reasoning,
-            market_context=MarketContext(**market_context),
+            market_context=market_context,
             references=references or []
         )
+        return trade, TradeJournal._trade_row(trade)
 
-        # Persist to database
-        success = self.db.insert_trade(trade.model_dump())
+    @staticmethod
+    def _trade_row(trade: TradeRecord) -> Dict[str, Any]:
+        """DB row for a validated TradeRecord (only market_context is dumped)."""
+        row = dict(trade.__dict__)
+        row['market_context'] = trade.market_context.model_dump()
+        return row
+
+    def record_trade(self, trade: TradeRecord) -> TradeRecord:
+        """
+        Record a fully built TradeRecord, outcome fields included.
+
+        For importers that know the whole trade up front: one INSERT
+        instead of record_decision() followed by record_outcome().
+
+        Args:
+            trade: Validated TradeRecord
+
+        Returns:
+            The same TradeRecord
+        """
+        success = self.db.insert_trade(self._trade_row(trade))
 
         if not success:
-            raise RuntimeError(f"Failed to insert trade {trade_id} to database")
+            raise RuntimeError(f"Failed to insert trade {trade.id} to database")
 
         return trade
 
@@ -168,6 +238,33 @@ class TradeJournal:
         # Convert back to TradeRecord model
         return TradeRecord(**trade_data)
 
+    def existing_ids(self, prefix: str) -> Set[str]:
+        """
+        IDs of already-recorded trades with the given ID prefix.
+
+        Lets bulk importers skip known trades with one query instead of a
+        get_trade() per candidate.
+
+        Args:
+            prefix: Trade ID prefix, e.g. "MT5-"
+
+        Returns:
+            Set of trade IDs
+        """
+        return self.db.query_trade_ids(prefix)
+
+    def known_ids(self, trade_ids: Sequence[str]) -> Set[str]:
+        """
+        Which of the given trade IDs are already recorded.
+
+        Args:
+            trade_ids: Candidate trade IDs
+
+        Returns:
+            Set of the IDs that exist in the journal
+        """
+        return self.db.query_known_trade_ids(trade_ids)
+
     def query_history(
         self,
         strategy: Optional[str] = None,
@@ -183,7 +280,7 @@ class TradeJournal:
             limit: Maximum results
 
         Returns:
-            List of TradeRecord instances
+            List of TradeRecord instances, newest first (timestamp DESC)
         """
         trades_data = self.db.query_trades(
             strategy=strategy,
@@ -193,6 +290,28 @@ class TradeJournal:
 
         return [TradeRecord(**td) for td in trades_data]
 
+    def query_history_raw(
+        self,
+        strategy: Optional[str] = None,
+        symbol: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Query trade history as plain dicts, for callers that only serialize.
+
+        Rows were validated on insert, so they are returned as stored:
+        timestamps stay ISO strings and no TradeRecord is built.
+
+        Args:
+            strategy: Filter by strategy tag
+            symbol: Filter by symbol
+            limit: Maximum results
+
+        Returns:
+            List of trade dicts, newest first (timestamp DESC)
+        """
+        return self.db.query_trades(strategy=strategy, symbol=symbol, limit=limit)
+
     def get_active_trades(self) -> List[TradeRecord]:
         """
         Get all currently open trades (no exit timestamp).
@@ -200,12 +319,6 @@ class TradeJournal:
         Returns:
             List of active TradeRecord instances
         """
-        # Query all recent trades and filter for active
-        all_trades = self.db.query_trades(limit=1000)
-
-        active = []
-        for td in all_trades:
-            if td.get('exit_timestamp') is None:
-                active.append(TradeRecord(**td))
-
-        return active
+        # Filtered in SQL through the open-trades partial index
+        open_trades = self.db.query_trades(only_open=True, limit=10_000)
+        return [TradeRecord(**td) for td in open_trades]
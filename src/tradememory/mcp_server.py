@@ -5,6 +5,7 @@ Exposes trade memory operations as MCP tools via FastMCP.
 Runs alongside the existing FastAPI server (separate entry point).
 """
 
+import asyncio
 import json
 import logging
 import uuid
@@ -62,16 +63,16 @@ async def get_strategy_performance(
         symbol: Filter by symbol. Returns all symbols if omitted.
     """
     db = _get_db()
-    trades = db.query_trades(
+    # Grouping and sums run in SQL; one row per strategy comes back.
+    # Off the event loop so concurrent tool calls read in parallel (WAL).
+    summary = await asyncio.to_thread(
+        db.strategy_pnl_summary,
         strategy=strategy_name,
         symbol=symbol.upper() if symbol else None,
         limit=10000,
     )
 
-    # Only count closed trades (have pnl)
-    closed = [t for t in trades if t.get("pnl") is not None]
-
-    if not closed:
+    if not summary:
         return {
             "strategy": strategy_name or "all",
             "symbol": symbol or "all",
@@ -79,39 +80,31 @@ async def get_strategy_performance(
             "message": "No closed trades found",
         }
 
-    # Group by strategy
-    by_strategy: dict[str, list] = {}
-    for t in closed:
-        s = t["strategy"]
-        by_strategy.setdefault(s, []).append(t)
-
     strategies = {}
-    for strat, strat_trades in by_strategy.items():
-        pnls = [t["pnl"] for t in strat_trades]
-        winners = [p for p in pnls if p > 0]
-        losers = [p for p in pnls if p <= 0]
-        total_pnl = sum(pnls)
-
-        best = max(strat_trades, key=lambda t: t["pnl"])
-        worst = min(strat_trades, key=lambda t: t["pnl"])
-
-        strategies[strat] = {
-            "trade_count": len(strat_trades),
-            "win_rate": round(len(winners) / len(strat_trades) * 100, 1),
+    for row in summary:
+        n = row["trade_count"]
+        wins = row["win_count"]
+        losses = row["loss_count"]
+        total_pnl = row["total_pnl"]
+        sum_losses = row["sum_losses"]
+
+        strategies[row["strategy"]] = {
+            "trade_count": n,
+            "win_rate": round(wins / n * 100, 1),
             "total_pnl": round(total_pnl, 2),
-            "avg_pnl": round(total_pnl / len(strat_trades), 2),
-            "avg_winner": round(sum(winners) / len(winners), 2) if winners else 0,
-            "avg_loser": round(sum(losers) / len(losers), 2) if losers else 0,
-            "best_trade": {"id": best["id"], "pnl": best["pnl"]},
-            "worst_trade": {"id": worst["id"], "pnl": worst["pnl"]},
+            "avg_pnl": round(total_pnl / n, 2),
+            "avg_winner": round(row["sum_wins"] / wins, 2) if wins else 0,
+            "avg_loser": round(sum_losses / losses, 2) if losses else 0,
+            "best_trade": {"id": row["best_id"], "pnl": row["best_pnl"]},
+            "worst_trade": {"id": row["worst_id"], "pnl": row["worst_pnl"]},
             "profit_factor": round(
-                sum(winners) / abs(sum(losers)), 2
-            ) if losers and sum(losers) != 0 else float("inf"),
+                row["sum_wins"] / abs(sum_losses), 2
+            ) if losses and sum_losses != 0 else float("inf"),
         }
 
     return {
         "symbol": symbol or "all",
-        "total_closed_trades": len(closed),
+        "total_closed_trades": sum(row["trade_count"] for row in summary),
         "strategies": strategies,
     }
 
@@ -128,7 +121,7 @@ async def get_trade_reflection(
         trade_id: The trade ID to look up
     """
     db = _get_db()
-    trade = db.get_trade(trade_id)
+    trade = await asyncio.to_thread(db.get_trade, trade_id)
 
     if not trade:
         return {"error": f"Trade '{trade_id}' not found"}
@@ -1143,7 +1136,9 @@ async def check_trade_legitimacy(
     db = _get_db()
 
     # 1. Total trades for this strategy
-    trades = db.query_trades(strategy=strategy_name, symbol=symbol, limit=10000)
+    trades = await asyncio.to_thread(
+        db.query_trade_outcomes, strategy=strategy_name, symbol=symbol, limit=10000
+    )
     memory_count = len(trades)
 
     # 2. Regime-specific trade count
@@ -123,6 +123,11 @@ class RiskStatus(str, Enum):
 
 class RiskConstraints(BaseModel):
     """Dynamic risk parameters calculated from trade history"""
+    # Frozen: one instance is cached per agent and shared by every
+    # TradeCheckResult; derive changes with model_copy(update=...).
+    # Fields can't be reassigned, but session_adjustments is a plain dict.
+    model_config = ConfigDict(frozen=True)
+
     max_lot_size: float = Field(default=0.1, description="Maximum allowed lot size")
     risk_per_trade_pct: float = Field(default=2.0, ge=0.5, le=5.0, description="Risk per trade as % of equity")
     daily_loss_limit: float = Field(default=500.0, description="Maximum daily loss in account currency")
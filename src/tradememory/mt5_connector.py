@@ -3,12 +3,27 @@ MT5 Connector - Bridge between MT5 demo account and TradeMemory.
 Records real demo trades into TradeJournal automatically.
 """
 
-from datetime import datetime
+import math
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 
 from .journal import TradeJournal
+from .models import TradeDirection, TradeRecord
 from .state import StateManager
 
+# Trading session for every hour of the day, indexed by datetime.hour:
+# 0-7 asian, 8-15 london, 16-23 newyork
+_SESSION_BY_HOUR = ("asian",) * 8 + ("london",) * 8 + ("newyork",) * 8
+
+# Earliest deal time a full first sync asks MT5 for
+_HISTORY_START = datetime(2020, 1, 1)
+
+# Recently synced trade IDs kept in memory per connector
+_SYNCED_ID_CACHE_SIZE = 10_000
+
 
 class MT5Connector:
     """
@@ -21,7 +36,8 @@ class MT5Connector:
     def __init__(
         self,
         journal: Optional[TradeJournal] = None,
-        state_manager: Optional[StateManager] = None
+        state_manager: Optional[StateManager] = None,
+        initial_history_days: Optional[int] = None
     ):
         """
         Initialize MT5 Connector.
@@ -29,10 +45,19 @@ class MT5Connector:
         Args:
             journal: TradeJournal instance
             state_manager: StateManager instance
+            initial_history_days: How far back an agent's first sync asks
+                MT5 for deals. None fetches everything since 2020-01-01.
         """
         self.journal = journal or TradeJournal()
         self.state_manager = state_manager or StateManager()
+        self.initial_history_days = initial_history_days
         self.mt5 = None
+        # Per agent: last_mt5_sync_timestamp as this connector last read or
+        # wrote it, so polling skips the state load
+        self._last_sync: Dict[str, int] = {}
+        # Trade IDs known to be in the journal, least recently seen first;
+        # bounded LRU, so a miss falls back to the journal
+        self._synced_ids: "OrderedDict[str, None]" = OrderedDict()
         self._init_mt5()
 
     def _init_mt5(self):
@@ -102,13 +127,21 @@ class MT5Connector:
         if not self.mt5:
             raise RuntimeError("MT5 not connected")
 
-        # Load last sync timestamp from state
-        state = self.state_manager.load_state(agent_id)
-        last_sync = state.warm_memory.get("last_mt5_sync_timestamp", 0)
+        # Last sync timestamp: cached after the first load from state
+        last_sync = self._last_sync.get(agent_id)
+        if last_sync is None:
+            state = self.state_manager.load_state(agent_id)
+            last_sync = state.warm_memory.get("last_mt5_sync_timestamp", 0)
 
-        # Get history deals since last sync
-        from_date = datetime.fromtimestamp(last_sync) if last_sync > 0 else datetime(2020, 1, 1)
+        # Get history deals since last sync; a first sync is bounded by
+        # initial_history_days when set
         to_date = datetime.now()
+        if last_sync > 0:
+            from_date = datetime.fromtimestamp(last_sync)
+        elif self.initial_history_days is not None:
+            from_date = to_date - timedelta(days=self.initial_history_days)
+        else:
+            from_date = _HISTORY_START
 
         history = self.mt5.history_deals_get(from_date, to_date)
 
@@ -122,81 +155,120 @@ class MT5Connector:
         # Group deals by position ticket
         positions = self._group_deals_by_position(history)
 
-        for position_ticket, deals in positions.items():
-            try:
-                # Check if already synced
-                trade_id = f"MT5-{position_ticket}"
-                existing = self.journal.get_trade(trade_id)
-
-                if existing:
-                    skipped += 1
-                    continue
-
-                # Extract trade data from deals
-                trade_data = self._extract_trade_data(deals)
-
-                if not trade_data:
-                    skipped += 1
-                    continue
-
-                # Record decision
-                self.journal.record_decision(
-                    trade_id=trade_id,
-                    symbol=trade_data['symbol'],
-                    direction=trade_data['direction'],
-                    lot_size=trade_data['lot_size'],
-                    strategy=trade_data['strategy'],
-                    confidence=trade_data['confidence'],
-                    reasoning=trade_data['reasoning'],
-                    market_context=trade_data['market_context'],
-                    references=trade_data.get('references', [])
-                )
-
-                # Record outcome if closed
-                if trade_data.get('exit_price'):
-                    self.journal.record_outcome(
-                        trade_id=trade_id,
-                        exit_price=trade_data['exit_price'],
-                        pnl=trade_data['pnl'],
-                        exit_reasoning=trade_data['exit_reasoning'],
-                        pnl_r=trade_data.get('pnl_r'),
-                        hold_duration=trade_data.get('hold_duration'),
-                        slippage=trade_data.get('slippage')
-                    )
-
-                synced += 1
-
-            except Exception as e:
-                print(f"Error syncing position {position_ticket}: {e}")
-                errors += 1
+        # Already-synced check: recently synced IDs from the in-memory
+        # cache, the rest in one journal lookup for this poll's positions
+        recent = self._synced_ids
+        trade_ids = [f"MT5-{ticket}" for ticket in positions]
+        misses = [trade_id for trade_id in trade_ids if trade_id not in recent]
+        existing = self.journal.known_ids(misses) if misses else set()
+        seen: List[str] = []
+
+        # One transaction for the whole sync: the journal's per-trade
+        # writes join it instead of committing one by one
+        with self.journal.db.get_connection():
+            for position_ticket, deals in positions.items():
+                try:
+                    # Check if already synced
+                    trade_id = f"MT5-{position_ticket}"
+                    if trade_id in recent or trade_id in existing:
+                        seen.append(trade_id)
+                        skipped += 1
+                        continue
+
+                    # Extract trade data from deals
+                    trade_data = self._extract_trade_data(deals)
+
+                    if not trade_data:
+                        skipped += 1
+                        continue
+
+                    # Closed positions are recorded with their outcome in
+                    # the same row: one INSERT, no follow-up UPDATE
+                    now = datetime.now(timezone.utc)
+                    outcome: Dict[str, Any] = {}
+                    if trade_data.get('exit_price'):
+                        outcome = {
+                            'exit_timestamp': now,
+                            'exit_price': trade_data['exit_price'],
+                            'pnl': trade_data['pnl'],
+                            'exit_reasoning': trade_data['exit_reasoning'],
+                            'hold_duration': trade_data.get('hold_duration'),
+                        }
+
+                    self.journal.record_trade(TradeRecord(
+                        id=trade_id,
+                        timestamp=now,
+                        symbol=trade_data['symbol'],
+                        direction=TradeDirection(trade_data['direction']),
+                        lot_size=trade_data['lot_size'],
+                        strategy=trade_data['strategy'],
+                        confidence=trade_data['confidence'],
+                        reasoning=trade_data['reasoning'],
+                        market_context=trade_data['market_context'],
+                        references=trade_data.get('references', []),
+                        **outcome
+                    ))
+
+                    seen.append(trade_id)
+                    synced += 1
+
+                except Exception as e:
+                    print(f"Error syncing position {position_ticket}: {e}")
+                    errors += 1
+
+        # Cached only once the transaction has committed
+        self._remember_synced(seen)
 
         # Update last sync timestamp
+        last_sync = int(to_date.timestamp())
         self.state_manager.update_warm_memory(
             agent_id,
             "last_mt5_sync_timestamp",
-            int(to_date.timestamp())
+            last_sync
         )
+        self._last_sync[agent_id] = last_sync
 
         return {"synced": synced, "skipped": skipped, "errors": errors}
 
-    def _group_deals_by_position(self, deals: tuple) -> Dict[int, List[Any]]:
-        """Group MT5 deals by position ticket."""
-        positions: Dict[int, List[Any]] = {}
+    def invalidate_sync_cursor(self, agent_id: Optional[str] = None):
+        """
+        Drop the cached last-sync timestamp so the next sync reloads it.
+
+        Call after changing last_mt5_sync_timestamp outside this connector.
+
+        Args:
+            agent_id: Agent to invalidate; all agents if None
+        """
+        if agent_id is None:
+            self._last_sync.clear()
+        else:
+            self._last_sync.pop(agent_id, None)
 
-        for deal in deals:
-            ticket = deal.position_id
-            if ticket not in positions:
-                positions[ticket] = []
-            positions[ticket].append(deal)
+    def _remember_synced(self, trade_ids: List[str]):
+        """Mark trade IDs as synced in the bounded LRU cache."""
+        cache = self._synced_ids
+        for trade_id in trade_ids:
+            cache[trade_id] = None
+            cache.move_to_end(trade_id)
+        while len(cache) > _SYNCED_ID_CACHE_SIZE:
+            cache.popitem(last=False)
 
-        return positions
+    def _group_deals_by_position(self, deals: tuple) -> Dict[int, List[Any]]:
+        """Group MT5 deals by position ticket, each group in time order."""
+        # One sort puts every position's deals together and in time order
+        ordered = sorted(deals, key=attrgetter("position_id", "time"))
+        return {
+            ticket: list(group)
+            for ticket, group in groupby(ordered, key=attrgetter("position_id"))
+        }
 
     def _extract_trade_data(self, deals: List) -> Optional[Dict[str, Any]]:
         """
         Extract TradeRecord data from MT5 deals.
 
         Args:
-            deals: List of MT5 deal objects for one position
+            deals: MT5 deal objects for one position, in time order (as
+                _group_deals_by_position returns them)
 
         Returns:
             Trade data dict or None if invalid
@@ -204,9 +276,6 @@ class MT5Connector:
         if not deals:
             return None
 
-        # Sort by time
-        deals = sorted(deals, key=lambda d: d.time)
-
         entry_deal = deals[0]
         exit_deal = deals[-1] if len(deals) > 1 else None
 
@@ -221,22 +290,19 @@ class MT5Connector:
         entry_price = entry_deal.price
         exit_price = exit_deal.price if exit_deal else None
 
-        # Calculate P&L
-        pnl = sum(d.profit for d in deals)
+        # Calculate P&L (fsum: correctly rounded over many partial fills)
+        pnl = math.fsum(map(attrgetter("profit"), deals))
 
-        # Extract timestamps
-        entry_time = datetime.fromtimestamp(entry_deal.time)
-        exit_time = datetime.fromtimestamp(exit_deal.time) if exit_deal else None
-
-        # Calculate hold duration
+        # Hold duration straight from the deals' unix seconds; only the
+        # entry needs a (local) datetime, for its session hour
         hold_duration = None
-        if exit_time:
-            hold_duration = int((exit_time - entry_time).total_seconds() / 60)  # Minutes
+        if exit_deal:
+            hold_duration = (exit_deal.time - entry_deal.time) // 60  # Minutes
 
         # Build market context
         market_context = {
             "price": entry_price,
-            "session": self._detect_session(entry_time)
+            "session": self._detect_session(datetime.fromtimestamp(entry_deal.time))
         }
 
         # Build trade data
@@ -258,13 +324,4 @@ class MT5Connector:
 
     def _detect_session(self, timestamp: datetime) -> str:
         """Detect trading session from timestamp"""
-        hour = timestamp.hour
-
-        if 0 <= hour < 8:
-            return "asian"
-        elif 8 <= hour < 16:
-            return "london"
-        elif 16 <= hour < 24:
-            return "newyork"
-        else:
-            return "unknown"
+        return _SESSION_BY_HOUR[timestamp.hour]
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import json
 import re
+from functools import lru_cache
 from typing import Optional
 
 
@@ -28,9 +29,12 @@ _JSON_KEY_FIELDS = {"regime", "atr", "atr_d1", "atr_h1", "symbol", "session",
                     "spread", "drawdown", "confidence", "timeframe", "hour_utc"}
 
 
+_TOKEN_RE = re.compile(r"[a-z0-9_.]+")
+
+
 def _tokenize(text: str) -> set[str]:
     """Split text into lowercase tokens on whitespace/punctuation."""
-    return set(re.findall(r"[a-z0-9_.]+", text.lower())) - {"", "none", "null"}
+    return set(_TOKEN_RE.findall(text.lower())) - {"", "none", "null"}
 
 
 def _extract_from_json(text: str) -> str:
@@ -58,6 +62,16 @@ def _extract_from_json(text: str) -> str:
     return " ".join(parts) if parts else text
 
 
+@lru_cache(maxsize=1024)
+def _context_tokens(text: str) -> frozenset[str]:
+    """Tokenize a context string after JSON key-field extraction.
+
+    Memoized: one recall compares the same current context against every
+    recalled memory, and stored memory contexts recur across recalls.
+    """
+    return frozenset(_tokenize(_extract_from_json(text)))
+
+
 def _detect_regime_warning(memory_ctx: str, current_ctx: str) -> Optional[str]:
     """Generate a specific warning if regime differs between contexts."""
     regimes = {"trending_up", "trending_down", "ranging", "volatile"}
@@ -106,13 +120,9 @@ def compute_context_drift(memory_context: str, current_context: str) -> dict:
     if not mem_str or not cur_str:
         return {"delta_s": 1.0, "zone": "danger", "warning": "One context is empty"}
 
-    # Extract from JSON if applicable
-    mem_extracted = _extract_from_json(mem_str)
-    cur_extracted = _extract_from_json(cur_str)
-
-    # Tokenize
-    mem_tokens = _tokenize(mem_extracted)
-    cur_tokens = _tokenize(cur_extracted)
+    # Extract from JSON if applicable, then tokenize
+    mem_tokens = _context_tokens(mem_str)
+    cur_tokens = _context_tokens(cur_str)
 
     if not mem_tokens and not cur_tokens:
         return {"delta_s": 0.0, "zone": "safe", "warning": None}
@@ -1023,9 +1023,8 @@ NEXT MONTH:
         finally:
             conn.close()
 
-        # Batch insert all patterns
-        for p in all_patterns:
-            target_db.insert_pattern(p)
+        # Batch insert all patterns (one transaction)
+        target_db.insert_patterns_bulk(all_patterns)
 
         return all_patterns
 
@@ -1818,8 +1817,7 @@ NEXT MONTH:
                             'applied_at': None,
                         })
 
-        # Store all adjustments (INSERT OR REPLACE → idempotent)
-        for adj in all_adjustments:
-            target_db.insert_adjustment(adj)
+        # Store all adjustments (INSERT OR REPLACE → idempotent, one transaction)
+        target_db.insert_adjustments_bulk(all_adjustments)
 
         return all_adjustments
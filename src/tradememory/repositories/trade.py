@@ -59,7 +59,9 @@ class TradeRepository:
         if self._db is not None:
             return self._db
         try:
-            return Database()
+            # Keep it: methods then share one cached connection per thread
+            self._db = Database()
+            return self._db
         except Exception as e:
             logger.error(f"Failed to connect to SQLite: {e}")
             raise DatabaseConnectionError(f"Cannot connect to database: {e}")
@@ -67,97 +69,91 @@ class TradeRepository:
     def get_trade_stats(self) -> TradeStats:
         """Query trade_records for P&L statistics."""
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            # Aggregate P&L stats from closed trades (pnl IS NOT NULL)
-            row = conn.execute("""
-                SELECT
-                    COUNT(*) as total_trades,
-                    COALESCE(SUM(pnl), 0.0) as total_pnl,
-                    COALESCE(SUM(CASE WHEN pnl > 0 THEN pnl ELSE 0 END), 0.0) as gross_profit,
-                    COALESCE(ABS(SUM(CASE WHEN pnl < 0 THEN pnl ELSE 0 END)), 0.0) as gross_loss,
-                    COALESCE(SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END), 0) as win_count,
-                    COALESCE(SUM(CASE WHEN pnl <= 0 THEN 1 ELSE 0 END), 0) as loss_count
-                FROM trade_records
-                WHERE pnl IS NOT NULL
-            """).fetchone()
-
-            # Distinct strategies
-            strategy_rows = conn.execute(
-                "SELECT DISTINCT strategy FROM trade_records ORDER BY strategy"
-            ).fetchall()
-            strategies = [r["strategy"] for r in strategy_rows]
-
-            # Last trade date
-            last_row = conn.execute(
-                "SELECT MAX(timestamp) as last_ts FROM trade_records"
-            ).fetchone()
-            last_trade_date = last_row["last_ts"] if last_row else None
-
-            return TradeStats(
-                total_trades=row["total_trades"],
-                total_pnl=row["total_pnl"],
-                gross_profit=row["gross_profit"],
-                gross_loss=row["gross_loss"],
-                win_count=row["win_count"],
-                loss_count=row["loss_count"],
-                strategies=strategies,
-                last_trade_date=last_trade_date,
-            )
+            with db.get_connection() as conn:
+                # Aggregate P&L stats from closed trades (pnl IS NOT NULL)
+                row = conn.execute("""
+                    SELECT
+                        COUNT(*) as total_trades,
+                        COALESCE(SUM(pnl), 0.0) as total_pnl,
+                        COALESCE(SUM(CASE WHEN pnl > 0 THEN pnl ELSE 0 END), 0.0) as gross_profit,
+                        COALESCE(ABS(SUM(CASE WHEN pnl < 0 THEN pnl ELSE 0 END)), 0.0) as gross_loss,
+                        COALESCE(SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END), 0) as win_count,
+                        COALESCE(SUM(CASE WHEN pnl <= 0 THEN 1 ELSE 0 END), 0) as loss_count
+                    FROM trade_records
+                    WHERE pnl IS NOT NULL
+                """).fetchone()
+
+                # Distinct strategies
+                strategy_rows = conn.execute(
+                    "SELECT DISTINCT strategy FROM trade_records ORDER BY strategy"
+                ).fetchall()
+                strategies = [r["strategy"] for r in strategy_rows]
+
+                # Last trade date
+                last_row = conn.execute(
+                    "SELECT MAX(timestamp) as last_ts FROM trade_records"
+                ).fetchone()
+                last_trade_date = last_row["last_ts"] if last_row else None
+
+                return TradeStats(
+                    total_trades=row["total_trades"],
+                    total_pnl=row["total_pnl"],
+                    gross_profit=row["gross_profit"],
+                    gross_loss=row["gross_loss"],
+                    win_count=row["win_count"],
+                    loss_count=row["loss_count"],
+                    strategies=strategies,
+                    last_trade_date=last_trade_date,
+                )
         except DatabaseConnectionError:
             raise
         except Exception as e:
             logger.error(f"Failed to query trade stats: {e}")
             raise DatabaseQueryError(f"Trade stats query failed: {e}")
-        finally:
-            conn.close()
 
     def get_memory_stats(self) -> MemoryStats:
         """Query episodic_memory for memory count and avg confidence."""
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            row = conn.execute("""
-                SELECT
-                    COUNT(*) as memory_count,
-                    COALESCE(AVG(confidence), 0.0) as avg_confidence
-                FROM episodic_memory
-            """).fetchone()
-
-            return MemoryStats(
-                memory_count=row["memory_count"],
-                avg_confidence=round(row["avg_confidence"], 4),
-            )
+            with db.get_connection() as conn:
+                row = conn.execute("""
+                    SELECT
+                        COUNT(*) as memory_count,
+                        COALESCE(AVG(confidence), 0.0) as avg_confidence
+                    FROM episodic_memory
+                """).fetchone()
+
+                return MemoryStats(
+                    memory_count=row["memory_count"],
+                    avg_confidence=round(row["avg_confidence"], 4),
+                )
         except Exception as e:
             logger.error(f"Failed to query memory stats: {e}")
             raise DatabaseQueryError(f"Memory stats query failed: {e}")
-        finally:
-            conn.close()
 
     def get_equity_stats(self) -> EquityStats:
         """Query affective_state for equity and drawdown."""
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            row = conn.execute("""
-                SELECT current_equity, peak_equity, drawdown_state
-                FROM affective_state
-                LIMIT 1
-            """).fetchone()
-
-            if row is None:
-                return EquityStats()
-
-            return EquityStats(
-                current_equity=row["current_equity"],
-                peak_equity=row["peak_equity"],
-                drawdown_state=row["drawdown_state"],
-            )
+            with db.get_connection() as conn:
+                row = conn.execute("""
+                    SELECT current_equity, peak_equity, drawdown_state
+                    FROM affective_state
+                    LIMIT 1
+                """).fetchone()
+
+                if row is None:
+                    return EquityStats()
+
+                return EquityStats(
+                    current_equity=row["current_equity"],
+                    peak_equity=row["peak_equity"],
+                    drawdown_state=row["drawdown_state"],
+                )
         except Exception as e:
             logger.error(f"Failed to query equity stats: {e}")
             raise DatabaseQueryError(f"Equity stats query failed: {e}")
-        finally:
-            conn.close()
 
     def get_closed_trades(
         self,
@@ -171,45 +167,43 @@ class TradeRepository:
         Returns raw rows as TradeRow dataclasses.
         """
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            query = """
-                SELECT id, timestamp, strategy, pnl, pnl_r
-                FROM trade_records
-                WHERE pnl IS NOT NULL
-            """
-            params: list = []
-
-            if start_date:
-                query += " AND timestamp >= ?"
-                params.append(start_date)
-            if end_date:
-                query += " AND timestamp <= ?"
-                params.append(end_date)
-            if strategy:
-                query += " AND strategy = ?"
-                params.append(strategy)
-
-            query += " ORDER BY timestamp ASC"
-
-            rows = conn.execute(query, params).fetchall()
-            return [
-                TradeRow(
-                    id=r["id"],
-                    timestamp=r["timestamp"],
-                    strategy=r["strategy"],
-                    pnl=r["pnl"],
-                    pnl_r=r["pnl_r"],
-                )
-                for r in rows
-            ]
+            with db.get_connection() as conn:
+                query = """
+                    SELECT id, timestamp, strategy, pnl, pnl_r
+                    FROM trade_records
+                    WHERE pnl IS NOT NULL
+                """
+                params: list = []
+
+                if start_date:
+                    query += " AND timestamp >= ?"
+                    params.append(start_date)
+                if end_date:
+                    query += " AND timestamp <= ?"
+                    params.append(end_date)
+                if strategy:
+                    query += " AND strategy = ?"
+                    params.append(strategy)
+
+                query += " ORDER BY timestamp ASC"
+
+                rows = conn.execute(query, params).fetchall()
+                return [
+                    TradeRow(
+                        id=r["id"],
+                        timestamp=r["timestamp"],
+                        strategy=r["strategy"],
+                        pnl=r["pnl"],
+                        pnl_r=r["pnl_r"],
+                    )
+                    for r in rows
+                ]
         except DatabaseConnectionError:
             raise
         except Exception as e:
             logger.error(f"Failed to query closed trades: {e}")
             raise DatabaseQueryError(f"Closed trades query failed: {e}")
-        finally:
-            conn.close()
 
     def get_memory_growth_by_regime(self) -> List["MemoryRegimeRow"]:
         """
@@ -218,30 +212,28 @@ class TradeRepository:
         Returns raw counts per (date, regime).
         """
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            rows = conn.execute("""
-                SELECT
-                    DATE(created_at) as date,
-                    COALESCE(context_regime, 'unknown') as regime,
-                    COUNT(*) as count
-                FROM episodic_memory
-                GROUP BY DATE(created_at), COALESCE(context_regime, 'unknown')
-                ORDER BY date ASC
-            """).fetchall()
-            return [
-                MemoryRegimeRow(
-                    date=r["date"],
-                    regime=r["regime"],
-                    count=r["count"],
-                )
-                for r in rows
-            ]
+            with db.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT
+                        DATE(created_at) as date,
+                        COALESCE(context_regime, 'unknown') as regime,
+                        COUNT(*) as count
+                    FROM episodic_memory
+                    GROUP BY DATE(created_at), COALESCE(context_regime, 'unknown')
+                    ORDER BY date ASC
+                """).fetchall()
+                return [
+                    MemoryRegimeRow(
+                        date=r["date"],
+                        regime=r["regime"],
+                        count=r["count"],
+                    )
+                    for r in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query memory growth: {e}")
             raise DatabaseQueryError(f"Memory growth query failed: {e}")
-        finally:
-            conn.close()
 
 
     def get_calibration_data(self) -> List["CalibrationRow"]:
@@ -251,28 +243,26 @@ class TradeRepository:
         Returns trade_id, confidence, pnl_r, strategy for calibration plot.
         """
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            rows = conn.execute("""
-                SELECT id, confidence, pnl_r, strategy
-                FROM episodic_memory
-                WHERE confidence IS NOT NULL AND pnl_r IS NOT NULL
-                ORDER BY timestamp ASC
-            """).fetchall()
-            return [
-                CalibrationRow(
-                    trade_id=r["id"],
-                    entry_confidence=r["confidence"],
-                    actual_pnl_r=r["pnl_r"],
-                    strategy=r["strategy"],
-                )
-                for r in rows
-            ]
+            with db.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT id, confidence, pnl_r, strategy
+                    FROM episodic_memory
+                    WHERE confidence IS NOT NULL AND pnl_r IS NOT NULL
+                    ORDER BY timestamp ASC
+                """).fetchall()
+                return [
+                    CalibrationRow(
+                        trade_id=r["id"],
+                        entry_confidence=r["confidence"],
+                        actual_pnl_r=r["pnl_r"],
+                        strategy=r["strategy"],
+                    )
+                    for r in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query calibration data: {e}")
             raise DatabaseQueryError(f"Calibration query failed: {e}")
-        finally:
-            conn.close()
 
     def get_strategy_trades(self, strategy: str) -> List["StrategyTradeRow"]:
         """
@@ -281,35 +271,33 @@ class TradeRepository:
         Returns detailed trade rows for strategy analysis.
         """
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            rows = conn.execute("""
-                SELECT
-                    tr.id, tr.timestamp, tr.pnl, tr.pnl_r,
-                    tr.hold_duration,
-                    em.context_session, em.confidence
-                FROM trade_records tr
-                LEFT JOIN episodic_memory em ON tr.id = em.id
-                WHERE tr.strategy = ? AND tr.pnl IS NOT NULL
-                ORDER BY tr.timestamp ASC
-            """, (strategy,)).fetchall()
-            return [
-                StrategyTradeRow(
-                    id=r["id"],
-                    timestamp=r["timestamp"],
-                    pnl=r["pnl"],
-                    pnl_r=r["pnl_r"],
-                    hold_duration=r["hold_duration"],
-                    context_session=r["context_session"],
-                    confidence=r["confidence"],
-                )
-                for r in rows
-            ]
+            with db.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT
+                        tr.id, tr.timestamp, tr.pnl, tr.pnl_r,
+                        tr.hold_duration,
+                        em.context_session, em.confidence
+                    FROM trade_records tr
+                    LEFT JOIN episodic_memory em ON tr.id = em.id
+                    WHERE tr.strategy = ? AND tr.pnl IS NOT NULL
+                    ORDER BY tr.timestamp ASC
+                """, (strategy,)).fetchall()
+                return [
+                    StrategyTradeRow(
+                        id=r["id"],
+                        timestamp=r["timestamp"],
+                        pnl=r["pnl"],
+                        pnl_r=r["pnl_r"],
+                        hold_duration=r["hold_duration"],
+                        context_session=r["context_session"],
+                        confidence=r["confidence"],
+                    )
+                    for r in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query strategy trades: {e}")
             raise DatabaseQueryError(f"Strategy trades query failed: {e}")
-        finally:
-            conn.close()
 
     def get_adjustments(self) -> List["AdjustmentRow"]:
         """
@@ -318,36 +306,34 @@ class TradeRepository:
         Returns adjustment events sorted by created_at DESC.
         """
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            rows = conn.execute("""
-                SELECT
-                    sa.adjustment_id, sa.created_at, sa.adjustment_type,
-                    sa.parameter, sa.old_value, sa.new_value, sa.reason,
-                    sa.status, p.strategy
-                FROM strategy_adjustments sa
-                LEFT JOIN patterns p ON sa.source_pattern_id = p.pattern_id
-                ORDER BY sa.created_at DESC
-            """).fetchall()
-            return [
-                AdjustmentRow(
-                    adjustment_id=r["adjustment_id"],
-                    created_at=r["created_at"],
-                    adjustment_type=r["adjustment_type"],
-                    parameter=r["parameter"],
-                    old_value=r["old_value"],
-                    new_value=r["new_value"],
-                    reason=r["reason"],
-                    status=r["status"],
-                    strategy=r["strategy"],
-                )
-                for r in rows
-            ]
+            with db.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT
+                        sa.adjustment_id, sa.created_at, sa.adjustment_type,
+                        sa.parameter, sa.old_value, sa.new_value, sa.reason,
+                        sa.status, p.strategy
+                    FROM strategy_adjustments sa
+                    LEFT JOIN patterns p ON sa.source_pattern_id = p.pattern_id
+                    ORDER BY sa.created_at DESC
+                """).fetchall()
+                return [
+                    AdjustmentRow(
+                        adjustment_id=r["adjustment_id"],
+                        created_at=r["created_at"],
+                        adjustment_type=r["adjustment_type"],
+                        parameter=r["parameter"],
+                        old_value=r["old_value"],
+                        new_value=r["new_value"],
+                        reason=r["reason"],
+                        status=r["status"],
+                        strategy=r["strategy"],
+                    )
+                    for r in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query adjustments: {e}")
             raise DatabaseQueryError(f"Adjustments query failed: {e}")
-        finally:
-            conn.close()
 
     def get_beliefs(self) -> List["BeliefRow"]:
         """
@@ -356,52 +342,48 @@ class TradeRepository:
         Returns all beliefs sorted by sample_size DESC.
         """
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            rows = conn.execute("""
-                SELECT
-                    id, proposition, alpha, beta, sample_size,
-                    strategy, regime, last_confirmed, last_contradicted
-                FROM semantic_memory
-                ORDER BY sample_size DESC
-            """).fetchall()
-            return [
-                BeliefRow(
-                    id=r["id"],
-                    proposition=r["proposition"],
-                    alpha=r["alpha"],
-                    beta=r["beta"],
-                    sample_size=r["sample_size"],
-                    strategy=r["strategy"],
-                    regime=r["regime"],
-                    last_confirmed=r["last_confirmed"],
-                    last_contradicted=r["last_contradicted"],
-                )
-                for r in rows
-            ]
+            with db.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT
+                        id, proposition, alpha, beta, sample_size,
+                        strategy, regime, last_confirmed, last_contradicted
+                    FROM semantic_memory
+                    ORDER BY sample_size DESC
+                """).fetchall()
+                return [
+                    BeliefRow(
+                        id=r["id"],
+                        proposition=r["proposition"],
+                        alpha=r["alpha"],
+                        beta=r["beta"],
+                        sample_size=r["sample_size"],
+                        strategy=r["strategy"],
+                        regime=r["regime"],
+                        last_confirmed=r["last_confirmed"],
+                        last_contradicted=r["last_contradicted"],
+                    )
+                    for r in rows
+                ]
         except Exception as e:
             logger.error(f"Failed to query beliefs: {e}")
             raise DatabaseQueryError(f"Beliefs query failed: {e}")
-        finally:
-            conn.close()
 
     def get_distinct_strategies(self) -> List[str]:
         """Return list of distinct strategy names from trade_records."""
         db = self._get_db()
-        conn = db._get_connection()
         try:
-            rows = conn.execute(
-                "SELECT DISTINCT strategy FROM trade_records ORDER BY strategy"
-            ).fetchall()
-            return [r["strategy"] for r in rows]
+            with db.get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT DISTINCT strategy FROM trade_records ORDER BY strategy"
+                ).fetchall()
+                return [r["strategy"] for r in rows]
         except Exception as e:
             logger.error(f"Failed to query distinct strategies: {e}")
             raise DatabaseQueryError(f"Distinct strategies query failed: {e}")
-        finally:
-            conn.close()
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeRow:
     """Raw trade row from database."""
 
@@ -412,7 +394,7 @@ class TradeRow:
     pnl_r: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryRegimeRow:
     """Raw memory regime count row from database."""
 
@@ -421,7 +403,7 @@ class MemoryRegimeRow:
     count: int
 
 
-@dataclass
+@dataclass(slots=True)
 class CalibrationRow:
     """Raw calibration data row from database."""
 
@@ -431,7 +413,7 @@ class CalibrationRow:
     strategy: str
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategyTradeRow:
     """Detailed trade row for strategy analysis."""
 
@@ -444,7 +426,7 @@ class StrategyTradeRow:
     confidence: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AdjustmentRow:
     """Raw adjustment row from database."""
 
@@ -459,7 +441,7 @@ class AdjustmentRow:
     strategy: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BeliefRow:
     """Raw belief row from semantic_memory."""
 
@@ -187,7 +187,7 @@ async def trade_query_history(req: QueryHistoryRequest):
     Search past trades by strategy/date/result.
     """
     try:
-        trades = journal.query_history(
+        trades = journal.query_history_raw(
             strategy=req.strategy,
             symbol=req.symbol,
             limit=req.limit
@@ -196,7 +196,7 @@ async def trade_query_history(req: QueryHistoryRequest):
         return {
             "success": True,
             "count": len(trades),
-            "trades": [t.model_dump() for t in trades]
+            "trades": trades
         }
 
     except Exception as e:
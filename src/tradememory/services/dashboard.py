@@ -20,6 +20,10 @@ logger = logging.getLogger(__name__)
 
 KNOWN_REGIMES = ("trending_up", "trending_down", "ranging", "volatile", "unknown")
 
+# Daily review files: YYYY-MM-DD.md names, "Grade: X" lines
+_REVIEW_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_REVIEW_GRADE_RE = re.compile(r"Grade:\s*([A-F])", re.IGNORECASE)
+
 BATCH_001_BASELINES = {
     "VolBreakout": {"pf": 1.17, "wr": 0.55},
     "IntradayMomentum": {"pf": 1.78, "wr": 0.58},
@@ -245,14 +249,13 @@ class DashboardService:
         if not reviews_dir.exists() or not reviews_dir.is_dir():
             return []
 
-        grade_re = re.compile(r"Grade:\s*([A-F])", re.IGNORECASE)
         strategy_keywords = ["VolBreakout", "IntradayMomentum", "Pullback", "MeanReversion"]
 
         results = []
         for md_file in reviews_dir.glob("*.md"):
             # Extract date from filename (YYYY-MM-DD.md)
             date_str = md_file.stem
-            if not re.match(r"\d{4}-\d{2}-\d{2}", date_str):
+            if not _REVIEW_DATE_RE.match(date_str):
                 continue
 
             # Apply date filters
@@ -268,7 +271,7 @@ class DashboardService:
                 continue
 
             # Parse grade
-            grade_match = grade_re.search(content)
+            grade_match = _REVIEW_GRADE_RE.search(content)
             grade = grade_match.group(1).upper() if grade_match else None
 
             # Parse strategy mentions
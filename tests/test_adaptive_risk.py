@@ -6,7 +6,7 @@ from datetime import datetime, timezone, timedelta
 from tradememory.db import Database
 from tradememory.journal import TradeJournal
 from tradememory.state import StateManager
-from tradememory.adaptive_risk import AdaptiveRisk
+from tradememory.adaptive_risk import AdaptiveRisk, _constraints_to_state
 from tradememory.models import (
     RiskStatus, RiskConstraints, TradeProposal, TradeCheckResult, TradeDirection,
 )
@@ -101,6 +101,52 @@ class TestSafeDefaults:
         assert c.status == RiskStatus.ACTIVE
         assert c.max_lot_size == 0.1
 
+    def test_defaults_use_instance_limits(self, risk, journal):
+        """Insufficient-data defaults carry the instance limits, not shared state."""
+        first = risk.calculate_constraints("agent-a")
+        assert first.max_lot_size == 0.1
+        assert first.daily_loss_limit == 200.0
+        assert first.consecutive_loss_limit == 3
+
+        first.session_adjustments["asian"] = 0.0
+        second = risk.calculate_constraints("agent-b")
+        assert second.session_adjustments["asian"] == 1.0
+        assert risk.get_constraints("agent-a").session_adjustments["asian"] == 1.0
+
+    def test_get_constraints_round_trips_stored_state(self, risk, state_manager):
+        """Stored constraints load back equal to the validated model."""
+        stored = RiskConstraints(
+            max_lot_size=0.05,
+            scale_factor=0.5,
+            status=RiskStatus.REDUCED,
+            session_adjustments={"asian": 0.5, "london": 1.0, "newyork": 0.75},
+        )
+        state_manager.update_risk_constraints("agent-rt", stored.model_dump(mode="json"))
+
+        loaded = risk.get_constraints("agent-rt")
+        assert loaded == stored
+        assert loaded.status is RiskStatus.REDUCED
+        assert loaded.updated_at.tzinfo is not None
+
+    @pytest.mark.parametrize("updated_at", [
+        datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc),
+        datetime(2026, 3, 1, 12, 30, 0, 123456, tzinfo=timezone(timedelta(hours=8))),
+        datetime(2026, 3, 1, 12, 30),
+    ])
+    def test_state_dump_matches_model_dump(self, updated_at):
+        """Hand-built state dict stays identical to pydantic's JSON dump."""
+        c = RiskConstraints(
+            status=RiskStatus.REDUCED,
+            session_adjustments={"asian": 0.5, "london": 1.0, "newyork": 0.75},
+            updated_at=updated_at,
+        )
+        assert _constraints_to_state(c) == c.model_dump(mode="json")
+
+    def test_default_state_manager_shares_journal_db(self, journal):
+        """Omitted StateManager reuses the journal's Database."""
+        r = AdaptiveRisk(journal=journal)
+        assert r.state_manager.db is journal.db
+
 
 # ==================== Kelly Criterion ====================
 
@@ -416,6 +462,85 @@ class TestEndToEnd:
         assert got.kelly_fraction == calc.kelly_fraction
         assert got.scale_factor == calc.scale_factor
 
+    def test_get_constraints_served_from_cache(self, risk, journal, monkeypatch):
+        """After calculate, get_constraints does not reload state."""
+        for i in range(1, 11):
+            _create_trade(journal, i, pnl=100.0 if i % 2 else -50.0)
+
+        agent = "agent-cache"
+        calc = risk.calculate_constraints(agent)
+
+        def _fail(agent_id):
+            raise AssertionError("load_state should not be called")
+
+        monkeypatch.setattr(risk.state_manager, "load_state", _fail)
+        got = risk.get_constraints(agent)
+        assert got.model_dump() == calc.model_dump()
+
+    def test_unchanged_recalculation_skips_write(self, risk, journal, monkeypatch):
+        """A recalculation with identical content is not persisted again."""
+        for i in range(1, 11):
+            _create_trade(journal, i, pnl=100.0 if i % 2 else -50.0)
+
+        agent = "agent-nochange"
+        first = risk.calculate_constraints(agent)
+
+        writes = []
+        monkeypatch.setattr(
+            risk.state_manager, "update_risk_constraints",
+            lambda agent_id, data: writes.append(data),
+        )
+        risk.calculate_constraints(agent)
+        assert writes == []
+
+        _create_trade(journal, 11, pnl=-400.0)
+        risk.calculate_constraints(agent)
+        assert len(writes) == 1
+        assert risk.get_constraints(agent).updated_at >= first.updated_at
+
+    def test_skip_compares_against_stored_state(self, risk, state_manager):
+        """A write skipped by one instance never leaves another's value stored."""
+        other = AdaptiveRisk(journal=risk.journal, state_manager=state_manager)
+        agent = "agent-shared"
+
+        risk._persist(agent, RiskConstraints(max_lot_size=0.1))
+        other._persist(agent, RiskConstraints(max_lot_size=0.02))
+        risk._persist(agent, RiskConstraints(max_lot_size=0.1))
+
+        assert state_manager.load_state(agent).risk_constraints["max_lot_size"] == 0.1
+        assert risk.get_constraints(agent).max_lot_size == 0.1
+
+    def test_permissive_fast_path_matches_full_check(self, risk):
+        """Fast path for permissive constraints gives the same results."""
+        agent = "agent-permissive"
+        risk._persist(agent, RiskConstraints(max_lot_size=0.1))
+
+        ok = risk.check_trade(agent, TradeProposal(
+            symbol="XAUUSD", direction=TradeDirection.LONG, lot_size=0.05,
+            strategy="VolBreakout", confidence=0.7, session="london",
+        ))
+        assert ok.approved and ok.adjusted_lot_size == 0.05 and ok.reasons == []
+
+        capped = risk.check_trade(agent, TradeProposal(
+            symbol="XAUUSD", direction=TradeDirection.LONG, lot_size=0.5,
+            strategy="VolBreakout", confidence=0.7,
+        ))
+        assert capped.adjusted_lot_size == 0.1
+        assert any("capped" in r for r in capped.reasons)
+
+        # Results share the cached constraints rather than copying them
+        shared = risk.get_constraints(agent)
+        assert ok.constraints_applied is shared
+        assert capped.constraints_applied is shared
+
+        # The fast path follows the constraints, even if their dict is edited
+        shared.session_adjustments["london"] = 0.5
+        reduced = risk.check_trade(agent, TradeProposal(
+            symbol="XAUUSD", direction=TradeDirection.LONG, lot_size=0.1,
+            strategy="VolBreakout", confidence=0.7, session="london",
+        ))
+        assert reduced.adjusted_lot_size == 0.05
+
     def test_calculate_then_check(self, risk, journal):
         """Full flow: calculate constraints then check a proposal."""
         # Interleave wins/losses so consecutive limit doesn't trigger STOPPED
@@ -6,12 +6,26 @@ import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
 
+from tradememory import backtest_importer
 from tradememory.backtest_importer import (
     classify_session,
     parse_mt5_report,
     parse_variant_tag,
     build_trade_records,
+    import_batch,
 )
+from tradememory.db import Database
+
+
+SAMPLE_REPORT_HTML = """<!DOCTYPE html>
+<html><body>
+<table>
+   <tr bgcolor="#F7F7F7" align=right><td>2024.01.03 15:15:00</td><td>2</td><td>XAUUSD</td><td>buy</td><td>in</td><td>0.05</td><td>2050.50</td><td>2</td><td>0.00</td><td>0.00</td><td>0.00</td><td>10000.00</td><td>NG_Gold v1</td></tr>
+   <tr bgcolor="#FFFFFF" align=right><td>2024.01.03 16:30:00</td><td>3</td><td>XAUUSD</td><td>sell</td><td>out</td><td>0.05</td><td>2055.00</td><td>3</td><td>0.00</td><td>0.00</td><td>22.50</td><td>10022.50</td><td></td></tr>
+   <tr bgcolor="#F7F7F7" align=right><td>2024.01.05 10:00:00</td><td>4</td><td>XAUUSD</td><td>sell</td><td>in</td><td>0.03</td><td>2060.00</td><td>4</td><td>0.00</td><td>0.00</td><td>0.00</td><td>10022.50</td><td>NG_Gold v1</td></tr>
+   <tr bgcolor="#FFFFFF" align=right><td>2024.01.05 14:00:00</td><td>5</td><td>XAUUSD</td><td>buy</td><td>out</td><td>0.03</td><td>2065.00</td><td>5</td><td>0.00</td><td>0.00</td><td>-15.00</td><td>10007.50</td><td></td></tr>
+</table>
+</body></html>"""
 
 
 class TestClassifySession:
@@ -54,20 +68,17 @@ class TestParseVariantTag:
         result = parse_variant_tag("PB_XAUUSD_BUY_RR2_PCT0.6")
         assert result['strategy'] == 'PullbackEntry'
 
+    def test_mutating_result_does_not_leak(self):
+        first = parse_variant_tag("VB_XAUUSD_BUY_RR3_BUF0.1")
+        first['strategy'] = 'Changed'
+        assert parse_variant_tag("VB_XAUUSD_BUY_RR3_BUF0.1")['strategy'] == 'VolBreakout'
+
 
 class TestParseMT5Report:
     @pytest.fixture
     def sample_report(self, tmp_path):
         """Create a minimal MT5-style HTML report (UTF-16LE)."""
-        html = """<!DOCTYPE html>
-<html><body>
-<table>
-   <tr bgcolor="#F7F7F7" align=right><td>2024.01.03 15:15:00</td><td>2</td><td>XAUUSD</td><td>buy</td><td>in</td><td>0.05</td><td>2050.50</td><td>2</td><td>0.00</td><td>0.00</td><td>0.00</td><td>10000.00</td><td>NG_Gold v1</td></tr>
-   <tr bgcolor="#FFFFFF" align=right><td>2024.01.03 16:30:00</td><td>3</td><td>XAUUSD</td><td>sell</td><td>out</td><td>0.05</td><td>2055.00</td><td>3</td><td>0.00</td><td>0.00</td><td>22.50</td><td>10022.50</td><td></td></tr>
-   <tr bgcolor="#F7F7F7" align=right><td>2024.01.05 10:00:00</td><td>4</td><td>XAUUSD</td><td>sell</td><td>in</td><td>0.03</td><td>2060.00</td><td>4</td><td>0.00</td><td>0.00</td><td>0.00</td><td>10022.50</td><td>NG_Gold v1</td></tr>
-   <tr bgcolor="#FFFFFF" align=right><td>2024.01.05 14:00:00</td><td>5</td><td>XAUUSD</td><td>buy</td><td>out</td><td>0.03</td><td>2065.00</td><td>5</td><td>0.00</td><td>0.00</td><td>-15.00</td><td>10007.50</td><td></td></tr>
-</table>
-</body></html>"""
+        html = SAMPLE_REPORT_HTML
         report_file = tmp_path / "test_report.htm"
         report_file.write_text(html, encoding='utf-16-le')
         return str(report_file)
@@ -102,6 +113,20 @@ class TestParseMT5Report:
         # Second trade: 10:00 to 14:00 = 240 min
         assert trades[1]['hold_duration_min'] == 240
 
+    def test_malformed_deal_time_skipped(self, tmp_path):
+        html = SAMPLE_REPORT_HTML.replace("2024.01.03 15:15:00", "2024-01-03 15:15")
+        report_file = tmp_path / "bad_time_report.htm"
+        report_file.write_text(html, encoding='utf-16-le')
+        trades = parse_mt5_report(str(report_file))
+        # First entry dropped, so its exit pairs with nothing; second trade intact
+        assert len(trades) == 1
+        assert trades[0]['entry_time'] == datetime(2024, 1, 5, 10, 0, tzinfo=timezone.utc)
+
+    def test_rows_split_across_read_chunks(self, sample_report, monkeypatch):
+        expected = parse_mt5_report(sample_report)
+        monkeypatch.setattr(backtest_importer, '_READ_CHUNK_CHARS', 37)
+        assert parse_mt5_report(sample_report) == expected
+
     def test_empty_report(self, tmp_path):
         html = "<!DOCTYPE html><html><body><table></table></body></html>"
         report_file = tmp_path / "empty_report.htm"
@@ -174,6 +199,59 @@ class TestBuildTradeRecords:
         assert records[0]['market_context']['session'] == 'asian'
 
 
+class TestImportBatch:
+    def test_import_and_reimport(self, tmp_path):
+        report_dir = tmp_path / "reports"
+        report_dir.mkdir()
+        (report_dir / "VB_XAUUSD_BUY_RR3_report.htm").write_text(
+            SAMPLE_REPORT_HTML, encoding='utf-16-le'
+        )
+        db_path = str(tmp_path / "bt.db")
+
+        stats = import_batch(str(report_dir), db_path)
+        assert stats['imported'] == 2
+        assert stats['skipped'] == 0
+        assert stats['by_strategy'] == {'VolBreakout': 2}
+
+        stored = Database(db_path).get_trade("BT-VB_XAUUSD_BUY_RR3-0001")
+        assert stored['pnl'] == 22.50
+        assert 'backtest' in stored['tags']
+
+        again = import_batch(str(report_dir), db_path)
+        assert again['imported'] == 0
+        assert again['skipped'] == 2
+
+    def test_verbose_prints_summary(self, tmp_path, capsys):
+        report_dir = tmp_path / "reports"
+        report_dir.mkdir()
+        (report_dir / "VB_XAUUSD_BUY_RR3_report.htm").write_text(
+            SAMPLE_REPORT_HTML, encoding='utf-16-le'
+        )
+
+        import_batch(str(report_dir), str(tmp_path / "quiet.db"))
+        assert capsys.readouterr().out == ""
+
+        import_batch(str(report_dir), str(tmp_path / "loud.db"), verbose=True)
+        assert capsys.readouterr().out == "  VB_XAUUSD_BUY_RR3: 2 trades parsed, 2 imported\n"
+
+    def test_worker_processes_match_in_process(self, tmp_path):
+        report_dir = tmp_path / "reports"
+        report_dir.mkdir()
+        for tag in ("VB_XAUUSD_BUY_RR3", "MR_XAUUSD_SELL_RR2"):
+            (report_dir / f"{tag}_report.htm").write_text(
+                SAMPLE_REPORT_HTML, encoding='utf-16-le'
+            )
+        (report_dir / "PB_XAUUSD_BOTH_RR2_report.htm").write_text(
+            "<html><table></table></html>", encoding='utf-16-le'
+        )
+
+        serial = import_batch(str(report_dir), str(tmp_path / "a.db"), max_workers=1)
+        parallel = import_batch(str(report_dir), str(tmp_path / "b.db"), max_workers=2)
+        assert parallel == serial
+        assert serial['imported'] == 4
+        assert serial['empty_reports'] == 1
+
+
 class TestWithRealReports:
     """Test with actual MT5 reports if available."""
 
@@ -214,3 +214,17 @@ class TestServiceUnit:
         result = service.get_overview()
         assert result["total_trades"] == 0
         assert result["total_pnl"] == 0.0
+
+    def test_default_repository_keeps_one_database(self, tmp_path, monkeypatch):
+        """A repo without an injected DB opens it once and reuses its connection."""
+        monkeypatch.setenv("TRADEMEMORY_DB", str(tmp_path / "env.db"))
+        repo = TradeRepository()
+        db = repo._get_db()
+        assert repo._get_db() is db
+
+        repo.get_trade_stats()
+        with db.get_connection() as first:
+            pass
+        repo.get_memory_stats()
+        with db.get_connection() as second:
+            assert second is first
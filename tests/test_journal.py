@@ -82,6 +82,24 @@ def test_record_outcome(journal):
     assert trade.lessons == "Good entry"
 
 
+def test_record_decisions_batch(journal):
+    """record_decisions stores every trade; a bad entry aborts before any write"""
+    decisions = [
+        dict(trade_id=f"T-2026-BATCH-{i}", symbol="XAUUSD", direction="long",
+             lot_size=0.05, strategy="VolBreakout", confidence=0.7,
+             reasoning="Batch", market_context={"price": 2900.0 + i})
+        for i in range(3)
+    ]
+    trades = journal.record_decisions(decisions)
+    assert [t.id for t in trades] == [d["trade_id"] for d in decisions]
+    assert journal.get_trade("T-2026-BATCH-2").market_context.price == 2902.0
+
+    bad = dict(decisions[0], trade_id="T-2026-BATCH-X", direction="up")
+    with pytest.raises(ValueError):
+        journal.record_decisions([dict(decisions[0], trade_id="T-2026-BATCH-Y"), bad])
+    assert journal.get_trade("T-2026-BATCH-Y") is None
+
+
 def test_get_trade(journal):
     """Test retrieving a trade by ID"""
     journal.record_decision(
@@ -130,6 +148,52 @@ def test_query_history(journal):
     assert len(pullback_trades) == 2  # 1, 3
 
 
+def test_query_history_newest_first(journal):
+    """query_history returns trades ordered by timestamp, newest first"""
+    for i in range(4):
+        journal.record_decision(
+            trade_id=f"T-2026-ORDER-{i:03d}",
+            symbol="XAUUSD",
+            direction="long",
+            lot_size=0.05,
+            strategy="VolBreakout",
+            confidence=0.7,
+            reasoning=f"Test {i}",
+            market_context={"price": 2890.00}
+        )
+
+    trades = journal.query_history(limit=10)
+    timestamps = [t.timestamp for t in trades]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+
+def test_query_history_raw_matches_serialized_history(journal):
+    """query_history_raw serializes to the same JSON as dumped TradeRecords"""
+    from fastapi.encoders import jsonable_encoder
+
+    for i in range(3):
+        journal.record_decision(
+            trade_id=f"T-2026-RAW-{i:03d}",
+            symbol="XAUUSD",
+            direction="long",
+            lot_size=0.05,
+            strategy="VolBreakout",
+            confidence=0.7,
+            reasoning=f"Test {i}",
+            market_context={"price": 2890.00, "session": "asian"}
+        )
+    journal.record_outcome(
+        trade_id="T-2026-RAW-001",
+        exit_price=2900.00,
+        pnl=50.00,
+        exit_reasoning="Target hit"
+    )
+
+    raw = journal.query_history_raw(limit=10)
+    dumped = [t.model_dump() for t in journal.query_history(limit=10)]
+    assert jsonable_encoder(raw) == jsonable_encoder(dumped)
+
+
 def test_get_active_trades(journal):
     """Test retrieving active (open) trades"""
     # Create 3 trades, close 1
@@ -189,3 +253,217 @@ def test_invalid_direction(journal):
             reasoning="Test",
             market_context={"price": 2890.00}
         )
+
+
+def test_database_uses_wal(temp_db):
+    """Schema init switches the file to WAL; connections run synchronous=NORMAL"""
+    with temp_db.get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_database_reuses_thread_connection(tmp_path):
+    """get_connection hands out one cached connection per thread until close()"""
+    with Database(str(tmp_path / "reuse.db")) as db:
+        with db.get_connection() as first:
+            pass
+        with db.get_connection() as second:
+            assert second is first
+
+        db.close()
+        with db.get_connection() as reopened:
+            assert reopened is not first
+            assert reopened.execute("SELECT COUNT(*) FROM trade_records").fetchone()[0] == 0
+
+
+def test_nested_connection_rolls_back_with_outer(temp_db):
+    """A failing outer block also discards writes made by nested blocks"""
+    with pytest.raises(RuntimeError):
+        with temp_db.get_connection() as outer:
+            with temp_db.get_connection() as inner:
+                assert inner is outer
+                inner.execute(
+                    "INSERT INTO session_state VALUES ('a1', '2026-01-01', '{}', '[]', '{}')"
+                )
+            raise RuntimeError("abort")
+
+    assert temp_db.load_session_state("a1") is None
+
+
+def test_filtered_trade_query_uses_composite_index(temp_db):
+    """strategy+symbol history is read in timestamp order from an index, no sort"""
+    with temp_db.get_connection() as conn:
+        plan = " ".join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM trade_records "
+            "WHERE strategy = ? AND symbol = ? ORDER BY timestamp DESC LIMIT ?",
+            ("VolBreakout", "XAUUSD", 100),
+        ))
+    assert "idx_trades_strategy_symbol_ts" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_partial_outcome_update_keeps_unset_columns(journal, temp_db):
+    """Omitted outcome keys are left alone; an explicit None clears the column"""
+    journal.record_decision(
+        trade_id="T-2026-TEST-UPD",
+        symbol="XAUUSD",
+        direction="long",
+        lot_size=0.05,
+        strategy="Pullback",
+        confidence=0.6,
+        reasoning="Test",
+        market_context={"price": 2900.00}
+    )
+    journal.record_outcome(
+        trade_id="T-2026-TEST-UPD",
+        exit_price=2905.00,
+        pnl=25.00,
+        exit_reasoning="Target",
+        lessons="Good entry"
+    )
+
+    assert temp_db.update_trade_outcome("T-2026-TEST-UPD", {"grade": "A", "lessons": None})
+    assert not temp_db.update_trade_outcome("T-2026-TEST-UPD", {"unknown": 1})
+
+    trade = temp_db.get_trade("T-2026-TEST-UPD")
+    assert trade["grade"] == "A"
+    assert trade["lessons"] is None
+    assert trade["pnl"] == 25.00
+    assert trade["exit_reasoning"] == "Target"
+
+
+def test_query_trade_outcomes_matches_query_trades(journal, temp_db):
+    """The narrow outcome query returns the same rows as query_trades, projected"""
+    for i, strategy in enumerate(["VolBreakout", "Pullback", "VolBreakout"]):
+        journal.record_decision(
+            trade_id=f"T-2026-OUT-{i}",
+            symbol="XAUUSD",
+            direction="long",
+            lot_size=0.05,
+            strategy=strategy,
+            confidence=0.6,
+            reasoning="Test",
+            market_context={"price": 2900.00}
+        )
+    journal.record_outcome("T-2026-OUT-0", exit_price=2905.0, pnl=25.0, exit_reasoning="TP")
+
+    full = temp_db.query_trades(strategy="VolBreakout", symbol="XAUUSD")
+    narrow = temp_db.query_trade_outcomes(strategy="VolBreakout", symbol="XAUUSD")
+    assert narrow == [
+        {"id": t["id"], "strategy": t["strategy"], "pnl": t["pnl"]} for t in full
+    ]
+
+
+def test_query_trades_projected(journal, temp_db):
+    """Projected rows carry only the requested keys; JSON columns are decoded"""
+    journal.record_decision(
+        trade_id="T-2026-PROJ-1",
+        symbol="XAUUSD",
+        direction="short",
+        lot_size=0.05,
+        strategy="Pullback",
+        confidence=0.6,
+        reasoning="Test",
+        market_context={"price": 2900.00, "session": "london"}
+    )
+
+    rows = temp_db.query_trades_projected(("id", "market_context", "references"))
+    assert rows == [{
+        "id": "T-2026-PROJ-1",
+        "market_context": temp_db.get_trade("T-2026-PROJ-1")["market_context"],
+        "references": [],
+    }]
+    assert rows[0]["market_context"]["session"] == "london"
+
+    with pytest.raises(ValueError):
+        temp_db.query_trades_projected(("id", "id; DROP TABLE trade_records"))
+
+
+def test_open_trade_query_uses_partial_index(temp_db):
+    """only_open history walks the open-positions partial index"""
+    with temp_db.get_connection() as conn:
+        plan = " ".join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM trade_records "
+            "WHERE exit_timestamp IS NULL ORDER BY timestamp DESC LIMIT ?",
+            (100,),
+        ))
+    assert "idx_trades_open_ts" in plan
+
+
+def test_strategy_query_needs_no_sort(temp_db):
+    """Strategy-only history walks (strategy, timestamp) with no sort step"""
+    with temp_db.get_connection() as conn:
+        plan = " ".join(r[3] for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM trade_records "
+            "WHERE strategy = ? ORDER BY timestamp DESC LIMIT ?",
+            ("VolBreakout", 100),
+        ))
+    assert "idx_trades_strategy_ts" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_existing_ids_by_prefix(journal):
+    """existing_ids returns exactly the trade IDs starting with the prefix"""
+    for trade_id in ("MT5-1", "MT5-20", "MT5.X", "MT4-1", "BT-MT5-1"):
+        journal.record_decision(
+            trade_id=trade_id,
+            symbol="XAUUSD",
+            direction="long",
+            lot_size=0.05,
+            strategy="VolBreakout",
+            confidence=0.7,
+            reasoning="Test",
+            market_context={"price": 2890.00}
+        )
+
+    assert journal.existing_ids("MT5-") == {"MT5-1", "MT5-20"}
+    assert journal.existing_ids("NONE-") == set()
+
+
+def test_record_trade_with_outcome(journal):
+    """record_trade stores a closed trade, outcome included, in one insert"""
+    from datetime import datetime, timezone
+    from tradememory.models import TradeRecord
+
+    now = datetime.now(timezone.utc)
+    journal.record_trade(TradeRecord(
+        id="T-2026-FULL-001",
+        timestamp=now,
+        symbol="XAUUSD",
+        direction="long",
+        lot_size=0.05,
+        strategy="VolBreakout",
+        confidence=0.5,
+        reasoning="Imported",
+        market_context={"price": 2890.00, "session": "london"},
+        exit_timestamp=now,
+        exit_price=2900.00,
+        pnl=50.00,
+        exit_reasoning="Position closed",
+        hold_duration=30
+    ))
+
+    trade = journal.get_trade("T-2026-FULL-001")
+    assert trade.pnl == 50.00
+    assert trade.hold_duration == 30
+    assert trade.exit_timestamp == now
+    assert trade.market_context.session == "london"
+    assert journal.get_active_trades() == []
+
+
+def test_known_ids(journal):
+    """known_ids returns the subset of candidate IDs already recorded"""
+    journal.record_decision(
+        trade_id="MT5-77",
+        symbol="XAUUSD",
+        direction="long",
+        lot_size=0.05,
+        strategy="VolBreakout",
+        confidence=0.7,
+        reasoning="Test",
+        market_context={"price": 2890.00}
+    )
+
+    candidates = [f"MT5-{i}" for i in range(1200)]
+    assert journal.known_ids(candidates) == {"MT5-77"}
+    assert journal.known_ids([]) == set()
@@ -77,6 +77,15 @@ async def test_get_strategy_performance_with_trades():
     assert im["trade_count"] == 1
     assert im["win_rate"] == 100.0
 
+    assert vb["best_trade"]["pnl"] == 200.0
+    assert vb["worst_trade"]["pnl"] == -100.0
+    assert vb["avg_winner"] == 200.0
+    assert vb["avg_loser"] == -100.0
+    assert vb["profit_factor"] == 2.0
+    assert im["profit_factor"] == float("inf")
+    # Most recently traded strategy first
+    assert list(result["strategies"]) == ["IntradayMomentum", "VolBreakout"]
+
 
 @pytest.mark.asyncio
 async def test_get_strategy_performance_filtered():
@@ -98,6 +107,22 @@ async def test_get_strategy_performance_filtered():
     assert result["symbol"] == "XAUUSD"
 
 
+@pytest.mark.asyncio
+async def test_get_strategy_performance_concurrent_calls():
+    from tradememory.mcp_server import get_strategy_performance, remember_trade
+
+    await remember_trade(
+        symbol="XAUUSD", direction="long", entry_price=2650.0,
+        exit_price=2670.0, pnl=200.0, strategy_name="VolBreakout",
+        market_context="test",
+    )
+
+    # Reads run on worker threads, each with its own connection
+    results = await asyncio.gather(*(get_strategy_performance() for _ in range(8)))
+    assert all(r == results[0] for r in results)
+    assert results[0]["total_closed_trades"] == 1
+
+
 # -- get_trade_reflection --
 
 
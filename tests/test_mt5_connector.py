@@ -199,6 +199,102 @@ class TestSyncTrades:
         assert result["skipped"] == 1
         assert result["synced"] == 0
 
+    def test_sync_cursor_loaded_once_until_invalidated(self, connector):
+        """The last-sync timestamp is read from state once, then cached."""
+        mock_mt5 = MagicMock()
+        mock_mt5.history_deals_get.return_value = ()
+        connector.mt5 = mock_mt5
+
+        with patch.object(
+            connector.state_manager, "load_state",
+            wraps=connector.state_manager.load_state,
+        ) as load_state:
+            # Each poll's write-back (update_warm_memory) loads state itself
+            connector.sync_trades("agent-poll")
+            assert load_state.call_count == 2
+            connector.sync_trades("agent-poll")
+            assert load_state.call_count == 3
+
+            connector.invalidate_sync_cursor("agent-poll")
+            connector.sync_trades("agent-poll")
+            assert load_state.call_count == 5
+
+        # Second poll asked MT5 from the cached cursor, not the 2020 sentinel
+        from_date = mock_mt5.history_deals_get.call_args_list[1].args[0]
+        assert from_date > datetime(2020, 1, 1)
+
+    def test_already_synced_check_uses_cache_then_journal(self, connector, db):
+        """Repeat polls hit the in-memory cache; a new connector asks the journal."""
+        deal = MagicMock()
+        deal.position_id = 4001
+        deal.symbol = "XAUUSD"
+        deal.volume = 0.05
+        deal.type = 0
+        deal.price = 2890.0
+        deal.profit = 0.0
+        deal.time = int(datetime(2026, 2, 23, 9, 0).timestamp())
+
+        mock_mt5 = MagicMock()
+        mock_mt5.history_deals_get.return_value = (deal,)
+        connector.mt5 = mock_mt5
+        connector.sync_trades()
+
+        with patch.object(connector.journal, "known_ids") as known_ids:
+            assert connector.sync_trades()["skipped"] == 1
+            known_ids.assert_not_called()
+
+        fresh = MT5Connector(
+            journal=TradeJournal(db=db), state_manager=StateManager(db=db)
+        )
+        fresh.mt5 = mock_mt5
+        assert fresh.sync_trades() == {"synced": 0, "skipped": 1, "errors": 0}
+
+    def test_synced_id_cache_is_bounded(self, connector):
+        """The synced-ID cache evicts the least recently seen IDs."""
+        with patch("tradememory.mt5_connector._SYNCED_ID_CACHE_SIZE", 2):
+            connector._remember_synced(["MT5-1", "MT5-2"])
+            connector._remember_synced(["MT5-1", "MT5-3"])
+        assert list(connector._synced_ids) == ["MT5-1", "MT5-3"]
+
+    def test_first_sync_window(self, connector):
+        """First sync starts at 2020 by default, or initial_history_days back."""
+        mock_mt5 = MagicMock()
+        mock_mt5.history_deals_get.return_value = ()
+        connector.mt5 = mock_mt5
+
+        connector.sync_trades("agent-full")
+        from_date, to_date = mock_mt5.history_deals_get.call_args.args
+        assert from_date == datetime(2020, 1, 1)
+
+        connector.initial_history_days = 90
+        connector.sync_trades("agent-bounded")
+        from_date, to_date = mock_mt5.history_deals_get.call_args.args
+        assert (to_date - from_date).days == 90
+
+    def test_sync_commits_good_positions_past_a_bad_one(self, connector, db):
+        """A failing position is counted as an error; the rest still commit."""
+        deals = []
+        for position_id, symbol in [(3001, None), (3002, "XAUUSD")]:
+            deal = MagicMock()
+            deal.position_id = position_id
+            deal.symbol = symbol  # None fails TradeRecord validation
+            deal.volume = 0.05
+            deal.type = 0
+            deal.price = 2890.0
+            deal.profit = 10.0
+            deal.time = int(datetime(2026, 2, 23, 9, 0).timestamp())
+            deals.append(deal)
+
+        mock_mt5 = MagicMock()
+        mock_mt5.history_deals_get.return_value = tuple(deals)
+        connector.mt5 = mock_mt5
+
+        result = connector.sync_trades()
+        assert result == {"synced": 1, "skipped": 0, "errors": 1}
+        # Visible to a separate connection, so the sync transaction committed
+        assert Database(str(db.db_path)).get_trade("MT5-3002") is not None
+        assert db.get_trade("MT5-3001") is None
+
 
 class TestDetectSession:
     """Tests for MT5Connector._detect_session()."""
@@ -219,6 +315,24 @@ class TestDetectSession:
         assert connector._detect_session(ts) == "newyork"
 
 
+class TestGroupDeals:
+    """Tests for MT5Connector._group_deals_by_position()."""
+
+    def test_groups_by_position_in_time_order(self, connector):
+        """Interleaved deals are grouped per position and sorted by time."""
+        deals = []
+        for position_id, time in [(7, 300), (5, 200), (7, 100), (5, 400)]:
+            deal = MagicMock()
+            deal.position_id = position_id
+            deal.time = time
+            deals.append(deal)
+
+        positions = connector._group_deals_by_position(tuple(deals))
+        assert sorted(positions) == [5, 7]
+        assert [d.time for d in positions[5]] == [200, 400]
+        assert [d.time for d in positions[7]] == [100, 300]
+
+
 class TestExtractTradeData:
     """Tests for MT5Connector._extract_trade_data()."""
 
@@ -422,6 +422,13 @@ class TestProspectiveMemory:
         results = db.query_prospective(status="expired")
         assert len(results) == 1
 
+    def test_update_status_keeps_unset_outcome(self, db):
+        db.insert_prospective(self._make_prospective())
+        db.update_prospective_status("F-001", "triggered", outcome_pnl_r=1.5)
+        assert db.update_prospective_status("F-001", "expired") is True
+        r = db.query_prospective(status="expired")[0]
+        assert r["outcome_pnl_r"] == 1.5
+
     def test_update_status_nonexistent(self, db):
         assert db.update_prospective_status("NOPE", "triggered") is False
 
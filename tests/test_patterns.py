@@ -150,6 +150,31 @@ class TestPatternsCRUD:
         assert result['confidence'] == 0.7
         assert result['metrics']['pnl_pct'] == 10.5
 
+    def test_insert_patterns_bulk(self, temp_db):
+        patterns = [
+            {
+                'pattern_id': f'BULK-{i:03d}',
+                'pattern_type': 'strategy_ranking',
+                'description': f'Bulk pattern {i}',
+                'confidence': 0.6,
+                'sample_size': 10 * i,
+                'date_range': '2025-01-01 to 2025-12-31',
+                'strategy': 'VolBreakout',
+                'symbol': 'XAUUSD',
+                'metrics': {'rank': i},
+                'source': 'backtest_auto',
+                'validation_status': 'IN_SAMPLE',
+                'discovered_at': '2026-02-28T12:00:00+00:00',
+            }
+            for i in range(1, 4)
+        ]
+        assert temp_db.insert_patterns_bulk(patterns) == 3
+
+        # Input left as-is; stored metrics decode back to dicts
+        assert patterns[0]['metrics'] == {'rank': 1}
+        assert temp_db.get_pattern('BULK-002')['metrics'] == {'rank': 2}
+        assert len(temp_db.query_patterns()) == 3
+
     def test_insert_pattern_replace(self, temp_db):
         pattern = {
             'pattern_id': 'TEST-001',
@@ -201,3 +201,22 @@ def test_last_active_updates_on_save(state_manager):
     time2 = state2.last_active
     
     assert time2 >= time1  # Should be newer or equal
+
+
+def test_resave_updates_row_in_place(state_manager, temp_db):
+    """Saving an existing agent again updates its row rather than replacing it"""
+    state_manager.update_warm_memory("agent-010", "first", 1)
+    with temp_db.get_connection() as conn:
+        rowid = conn.execute(
+            "SELECT rowid FROM session_state WHERE agent_id = ?", ("agent-010",)
+        ).fetchone()[0]
+
+    state_manager.update_warm_memory("agent-010", "second", 2)
+    with temp_db.get_connection() as conn:
+        rows = conn.execute(
+            "SELECT rowid FROM session_state WHERE agent_id = ?", ("agent-010",)
+        ).fetchall()
+
+    assert [r[0] for r in rows] == [rowid]
+    assert state_manager.get_warm_memory("agent-010", "first") == 1
+    assert state_manager.get_warm_memory("agent-010", "second") == 2